@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import time
+
+import zorge
+
+import pancho
+from pancho.implementation import processing
+
+from . import synthetic
+
+PROFILES = {
+    'quick': {
+        'registry_sizes': (10, 100, 1000),
+        'chain_depths': (10,),
+        'fan_out_widths': (10,),
+        'hierarchy_depths': (10,),
+        'iterations': 200,
+        'repeats': 3,
+    },
+    'full': {
+        'registry_sizes': (10, 100, 1000, 10000),
+        'chain_depths': (10, 100),
+        'fan_out_widths': (10, 100, 1000),
+        'hierarchy_depths': (10, 50),
+        'iterations': 2000,
+        'repeats': 5,
+    },
+}
+
+
+@dataclasses.dataclass
+class Result:
+    name: str
+    unit: str
+    value: float
+    samples: list[float]
+
+
+def measure(func, repeats: int, setup=None) -> list[float]:
+    samples = []
+    for _ in range(repeats):
+        args = () if setup is None else (setup(),)
+        started_at = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - started_at)
+    return samples
+
+
+def measure_async(func, repeats: int) -> list[float]:
+    async def run():
+        samples = []
+        for _ in range(repeats):
+            started_at = time.perf_counter()
+            await func()
+            samples.append(time.perf_counter() - started_at)
+        return samples
+
+    return asyncio.run(run())
+
+
+def result(name: str, samples: list[float], per: int = 1, unit: str = 's') -> Result:
+    return Result(
+        name=name,
+        unit=unit,
+        value=min(samples) / per,
+        samples=[sample / per for sample in samples]
+    )
+
+
+def bench_registry(profile: dict) -> list[Result]:
+    results = []
+    for size in profile['registry_sizes']:
+        flow = synthetic.catalogue(size)
+        module = flow.module()
+
+        def add():
+            registry = pancho.ActorRegistry()
+            for actor in flow.actors:
+                registry.add(actor)
+
+        results.append(result(f'registry.add[{size}]', measure(add, profile['repeats'])))
+        results.append(result(
+            f'registry.register_module[{size}]',
+            measure(lambda: pancho.register_module(pancho.ActorRegistry(), module), profile['repeats'])
+        ))
+        # freeze() caches its result, so every repeat compiles a registry of its own
+        results.append(result(f'registry.freeze[{size}]', measure(
+            lambda registry: registry.freeze(),
+            profile['repeats'],
+            setup=lambda: pancho.register_module(pancho.ActorRegistry(), module)
+        )))
+    return results
+
+
+def bench_scheduling(profile: dict) -> list[Result]:
+    results = []
+    flows = [
+        *(('chain', depth, synthetic.chain(depth)) for depth in profile['chain_depths']),
+        *(('fan_out', width, synthetic.fan_out(width)) for width in profile['fan_out_widths']),
+        *(('hierarchy', depth, synthetic.hierarchy(depth)) for depth in profile['hierarchy_depths']),
+    ]
+    for shape, size, flow in flows:
+        registry = pancho.register_module(pancho.ActorRegistry(), flow.module()).freeze()
+        messages = [message() for message in flow.messages]
+        iterations = profile['iterations']
+
+        def schedule():
+            for _ in range(iterations):
+                loop = processing.Loop(registry, processing.Stream())
+                for message in messages:
+                    loop.register(message)
+
+        results.append(result(f'loop.register.{shape}[{size}]', measure(schedule, profile['repeats']), iterations))
+    return results
+
+
+def bench_processing(profile: dict) -> list[Result]:
+    results = []
+    container = zorge.Container()
+    container.register_dependency(
+        implementation=synthetic.SyntheticRepositoryContract,
+        contract=synthetic.SyntheticRepositoryContract
+    )
+    flows = [
+        *(('chain', depth, synthetic.chain, depth) for depth in profile['chain_depths']),
+        *(('fan_out', width, synthetic.fan_out, width) for width in profile['fan_out_widths']),
+    ]
+    iterations = profile['iterations']
+    for shape, size, factory, argument in flows:
+        flow = factory(argument)
+        registry = pancho.register_module(pancho.ActorRegistry(), flow.module()).freeze()
+        task = flow.instance()
+
+        async def process():
+            for _ in range(iterations):
+                async for _ in pancho.CQProcessor(registry)(task):
+                    pass
+
+        results.append(result(
+            f'processor.{shape}[{size}]', measure_async(process, profile['repeats']), iterations
+        ))
+
+        executor = pancho.TaskExecutor(container, registry)
+
+        async def execute():
+            for _ in range(iterations):
+                await executor.run(task)
+
+        results.append(result(
+            f'executor.run.{shape}[{size}]', measure_async(execute, profile['repeats']), iterations
+        ))
+
+        flow = factory(argument, synthetic.SyntheticRepositoryContract)
+        registry = pancho.register_module(pancho.ActorRegistry(), flow.module()).freeze()
+        task = flow.instance()
+        executor = pancho.TaskExecutor(container, registry)
+
+        results.append(result(
+            f'executor.run.di.{shape}[{size}]', measure_async(execute, profile['repeats']), iterations
+        ))
+    return results
+
+
+def compare(current: list[Result], baseline_path: pathlib.Path, threshold: float) -> bool:
+    baseline = {r['name']: r for r in json.loads(baseline_path.read_text())['results']}
+    regressed = False
+    for r in current:
+        if (previous := baseline.get(r.name)) is None:
+            print(f'{r.name:45} {r.value:12.6f}{r.unit}   (new)')
+            continue
+        ratio = r.value / previous['value'] if previous['value'] else float('inf')
+        marker = ''
+        if ratio > 1 + threshold:
+            marker = '  REGRESSION'
+            regressed = True
+        print(f'{r.name:45} {r.value:12.6f}{r.unit} {ratio:8.2f}x{marker}')
+    return not regressed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='pancho benchmarks')
+    parser.add_argument('--profile', choices=PROFILES, default='quick')
+    parser.add_argument('--only', choices=('registry', 'scheduling', 'processing'), action='append')
+    parser.add_argument('--output', type=pathlib.Path, help='store results as json')
+    parser.add_argument('--compare', type=pathlib.Path, help='json results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown ratio')
+    args = parser.parse_args(argv)
+
+    profile = PROFILES[args.profile]
+    suites = {
+        'registry': bench_registry,
+        'scheduling': bench_scheduling,
+        'processing': bench_processing,
+    }
+    results = []
+    for name, suite in suites.items():
+        if not args.only or name in args.only:
+            results.extend(suite(profile))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(
+            {
+                'profile': args.profile,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'pancho': _version(),
+                'created_at': time.time(),
+                'results': [dataclasses.asdict(r) for r in results],
+            },
+            indent=2
+        ))
+    if args.compare:
+        return 0 if compare(results, args.compare, args.threshold) else 1
+    for r in results:
+        print(f'{r.name:45} {r.value:12.6f}{r.unit}  (median {statistics.median(r.samples):.6f})')
+    return 0
+
+
+def _version() -> str | None:
+    try:
+        from importlib.metadata import version
+        return version('pancho')
+    except Exception:
+        return None
+
+
+if __name__ == '__main__':
+    sys.exit(main())
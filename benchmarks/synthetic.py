@@ -0,0 +1,97 @@
+import dataclasses
+import types
+
+from pancho.definition import contracts
+
+
+class SyntheticRepositoryContract:
+    pass
+
+
+@dataclasses.dataclass
+class SyntheticFlow:
+    task: type[contracts.Command]
+    actors: list
+    messages: list[type]
+
+    def module(self, name: str = 'synthetic_actors') -> types.ModuleType:
+        module = types.ModuleType(name)
+        for actor in self.actors:
+            actor.__module__ = name
+            setattr(module, actor.__name__, actor)
+        return module
+
+    def instance(self) -> contracts.Command:
+        return self.task()
+
+
+def message_class(name: str, *bases: type) -> type:
+    cls = dataclasses.make_dataclass(name, [], bases=bases or (contracts.Event,), frozen=True)
+    cls.__module__ = __name__
+    return cls
+
+
+def actor(
+    name: str,
+    consumes: type,
+    produces: type | None = None,
+    dependency: type | None = None
+):
+    if dependency is None:
+        def executable(message):
+            return produces() if produces else None
+    else:
+        def executable(message, repository):
+            return produces() if produces else None
+
+        executable.__annotations__['repository'] = dependency
+    executable.__name__ = executable.__qualname__ = name
+    executable.__annotations__.update(message=consumes, **{'return': produces})
+    return executable
+
+
+def chain(depth: int, dependency: type | None = None) -> SyntheticFlow:
+    task = message_class('ChainCommand', contracts.Command)
+    messages = [task] + [message_class(f'ChainEvent{i}') for i in range(depth)]
+    actors = [
+        actor(f'chain_step_{i}_usecase', messages[i], messages[i + 1], dependency)
+        for i in range(depth)
+    ]
+    return SyntheticFlow(task=task, actors=actors, messages=messages)
+
+
+def fan_out(width: int, dependency: type | None = None) -> SyntheticFlow:
+    task = message_class('FanOutCommand', contracts.Command)
+    event = message_class('FanOutEvent')
+    actors = [actor('fan_out_usecase', task, event, dependency)] + [
+        actor(f'fan_out_{i}_writer', event, None, dependency)
+        for i in range(width)
+    ]
+    return SyntheticFlow(task=task, actors=actors, messages=[task, event])
+
+
+def hierarchy(depth: int, actors_per_level: int = 1) -> SyntheticFlow:
+    bases = [message_class('HierarchyCommand0', contracts.Command)]
+    for i in range(1, depth):
+        bases.append(message_class(f'HierarchyCommand{i}', bases[-1]))
+    actors = [
+        actor(f'hierarchy_{level}_{i}_writer', base)
+        for level, base in enumerate(bases)
+        for i in range(actors_per_level)
+    ]
+    return SyntheticFlow(task=bases[-1], actors=actors, messages=bases)
+
+
+def catalogue(size: int, messages_count: int = 100) -> SyntheticFlow:
+    task = message_class('CatalogueCommand', contracts.Command)
+    messages = [message_class(f'CatalogueEvent{i}') for i in range(messages_count)]
+    actors = [
+        actor(
+            f'catalogue_{i}_usecase',
+            messages[i % messages_count],
+            messages[(i + 1) % messages_count],
+            SyntheticRepositoryContract
+        )
+        for i in range(size)
+    ]
+    return SyntheticFlow(task=task, actors=actors, messages=[task] + messages)
@@ -1,8 +1,26 @@
 from .implementation import (
     TaskExecutor,
+    RemoteTaskExecutor,
+    TaskWorker,
+    InMemoryBroker,
+    MultiprocessingBroker,
+    WorkerPool,
     CQProcessor,
     ActorRegistry,
-    register_module
+    CompiledActorRegistry,
+    ExecutionPlanner,
+    TaskScheduler,
+    PriorityClass,
+    MessageCache,
+    QueryCache,
+    BatchWindow,
+    ConcurrencyLimit,
+    RateLimit,
+    CircuitBreaker,
+    Instrumentation,
+    MetricsAggregator,
+    register_module,
+    discover_module
 )
 from .definition.contracts import (
     Error,
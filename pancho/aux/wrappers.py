@@ -1,31 +1,74 @@
 import typing
-import functools
 import traceback
 
 from ..definition.contracts import Error
+from ..implementation.caching import MessageCache
+from ..implementation.batching import BatchWindow
+from ..implementation.guarding import Guard
 
 
-def semantic(kind: typing.Literal['usecase', 'io', 'auditor', 'context', 'response', 'reader', 'writer']):
+def semantic(
+    kind: typing.Literal['usecase', 'io', 'auditor', 'context', 'response', 'reader', 'writer'],
+    policy: typing.Literal['inline', 'thread', 'process'] | None = None,
+    cache: MessageCache | None = None,
+    timeout: float | None = None,
+    deferred: bool | None = None,
+    batch: BatchWindow | None = None,
+    guards: typing.Sequence[Guard] | None = None,
+    remote: bool | None = None
+):
     def decorator(func):
         func.__dict__['__semantic__'] = kind
+        return _attach_options(
+            func,
+            policy=policy,
+            cache=cache,
+            timeout=timeout,
+            deferred=deferred,
+            batch=batch,
+            guards=guards,
+            remote=remote
+        )
+
+    return decorator
 
-        @functools.wraps(func)
-        async def wrapper(*args, **kwargs):
-            return await func(*args, **kwargs)
 
-        return wrapper
+def options(
+    policy: typing.Literal['inline', 'thread', 'process'] | None = None,
+    cache: MessageCache | None = None,
+    timeout: float | None = None,
+    deferred: bool | None = None,
+    batch: BatchWindow | None = None,
+    guards: typing.Sequence[Guard] | None = None,
+    remote: bool | None = None
+):
+    def decorator(func):
+        return _attach_options(
+            func,
+            policy=policy,
+            cache=cache,
+            timeout=timeout,
+            deferred=deferred,
+            batch=batch,
+            guards=guards,
+            remote=remote
+        )
 
     return decorator
 
 
 def skip(func):
     func.__dict__['__semantic__'] = 'skip'
+    return func
 
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
-        return await func(*args, **kwargs)
 
-    return wrapper
+def _attach_options(func, **options):
+    # metadata only, the actor itself is registered and called as is
+    func.__dict__['__options__'] = {
+        **func.__dict__.get('__options__', {}),
+        **{k: v for k, v in options.items() if v is not None}
+    }
+    return func
 
 
 def default_exception(
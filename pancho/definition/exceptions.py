@@ -20,6 +20,15 @@ class CannotRegisterActor(PanchoException):
         return f'Cannot register actor: {self._actor}'
 
 
+class ActorOptionNotSupported(CannotRegisterActor):
+    def __init__(self, actor: zodchy.codex.cqea.Actor, option: str):
+        self._option = option
+        super().__init__(actor)
+
+    def message(self):
+        return f'Option {self._option} is not supported by actor: {self._actor}'
+
+
 class CannotDeriveActorPurpose(PanchoException):
     def __init__(self, actor: zodchy.codex.cqea.Actor):
         self._actor = actor
@@ -64,3 +73,42 @@ class ActorSemanticDefinitionFailed(PanchoException):
 
     def message(self):
         return f'Actor semantic definition failed: {self._name}'
+
+
+class ActorExecutorNotConfigured(PanchoException):
+    def __init__(self, actor_id: ActorIdType, policy: typing.Any):
+        self._actor_id = actor_id
+        self._policy = policy
+        super().__init__(self.message())
+
+    def message(self):
+        return f'Executor is not configured for {self._policy} of {self._actor_id}'
+
+
+class ActorPolicyNotSupported(PanchoException):
+    def __init__(self, actor_id: ActorIdType, policy: typing.Any):
+        self._actor_id = actor_id
+        self._policy = policy
+        super().__init__(self.message())
+
+    def message(self):
+        return f'{self._policy} is not supported by {self._actor_id}, its dependencies cannot leave the process'
+
+
+class ActorReferenceNotResolvable(PanchoException):
+    def __init__(self, reference: str):
+        self._reference = reference
+        super().__init__(self.message())
+
+    def message(self):
+        return f'Actor reference is not resolvable: {self._reference}'
+
+
+class DeferredActorFailed(PanchoException):
+    def __init__(self, actor_id: ActorIdType, error: typing.Any):
+        self._actor_id = actor_id
+        self._error = error
+        super().__init__(self.message())
+
+    def message(self):
+        return f'Deferred actor {self._actor_id} failed: {self._error}'
@@ -1,3 +1,12 @@
 from .processing import CQProcessor
-from .execution import TaskExecutor
-from .registry import ActorRegistry, register_module
+from .execution import TaskExecutor, RemoteTaskExecutor, TaskWorker
+from .distribution import InMemoryBroker, MultiprocessingBroker
+from .pooling import WorkerPool
+from .registry import ActorRegistry, CompiledActorRegistry, register_module
+from .planning import ExecutionPlanner
+from .scheduling import TaskScheduler, PriorityClass
+from .discovery import discover_module
+from .caching import MessageCache, QueryCache
+from .batching import BatchWindow
+from .guarding import ConcurrencyLimit, RateLimit, CircuitBreaker
+from .instrumentation import Instrumentation, MetricsAggregator
@@ -0,0 +1,72 @@
+import asyncio
+import collections.abc
+import typing
+
+BatchCall: typing.TypeAlias = collections.abc.Callable[
+    [list[typing.Any]], collections.abc.Awaitable[collections.abc.Sequence[typing.Any]]
+]
+
+
+class BatchWindow:
+    def __init__(
+        self,
+        max_size: int = 100,
+        max_delay: float = 0.005
+    ):
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._pending: list[tuple[collections.abc.Sequence[typing.Any], asyncio.Future]] = []
+        self._size = 0
+        self._call: BatchCall | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Future] = set()
+
+    async def submit(
+        self,
+        items: collections.abc.Sequence[typing.Any],
+        call: BatchCall
+    ) -> collections.abc.Sequence[typing.Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            # the first submitter's call is used for the whole batch
+            self._call = call
+            self._timer = loop.call_later(self._max_delay, self._flush)
+        self._pending.append((items, future))
+        self._size += len(items)
+        if self._size >= self._max_size:
+            self._flush()
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, call = self._pending, self._call
+        self._pending, self._size, self._call = [], 0, None
+        if pending and call is not None:
+            task = asyncio.ensure_future(self._run(pending, call))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    @staticmethod
+    async def _run(
+        pending: list[tuple[collections.abc.Sequence[typing.Any], asyncio.Future]],
+        call: BatchCall
+    ):
+        try:
+            results = await call([item for items, _ in pending for item in items])
+        except asyncio.CancelledError:
+            for _, future in pending:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        offset = 0
+        for items, future in pending:
+            if not future.done():
+                future.set_result(results[offset:offset + len(items)])
+            offset += len(items)
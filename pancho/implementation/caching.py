@@ -0,0 +1,198 @@
+import asyncio
+import collections
+import collections.abc
+import dataclasses
+import functools
+import time
+import typing
+
+import zodchy
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class MessageCache:
+    def __init__(
+        self,
+        ttl: float | None = None,
+        maxsize: int = 1024,
+        clock: collections.abc.Callable[[], float] = time.monotonic
+    ):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._clock = clock
+        self._entries: collections.OrderedDict[
+            collections.abc.Hashable, tuple[float | None, typing.Any]
+        ] = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: collections.abc.Hashable) -> typing.Any | None:
+        try:
+            expires_at, value = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            return None
+        if expires_at is not None and expires_at <= self._clock():
+            del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: collections.abc.Hashable, value: typing.Any, ttl: float | None = None):
+        ttl = self._ttl if ttl is None else ttl
+        self._entries[key] = (None if ttl is None else self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, *messages: typing.Any):
+        self._entries.pop(message_key(*messages), None)
+
+    def discard(self, key: collections.abc.Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self._entries)
+        )
+
+    def __iter__(self) -> collections.abc.Iterator[collections.abc.Hashable]:
+        return iter(list(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class QueryCache:
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        ttls: collections.abc.Mapping[type[zodchy.codex.cqea.Query], float] | None = None,
+        invalidations: collections.abc.Mapping[
+            type[zodchy.codex.cqea.Event],
+            collections.abc.Collection[type[zodchy.codex.cqea.Query]]
+        ] | None = None,
+        clock: collections.abc.Callable[[], float] = time.monotonic
+    ):
+        self._cache = MessageCache(ttl=ttl, maxsize=maxsize, clock=clock)
+        self._ttls = ttls or {}
+        self._invalidations = invalidations or {}
+        self._in_flight = SingleFlight()
+        self._generations: collections.Counter[type[zodchy.codex.cqea.Query] | None] = collections.Counter()
+
+    async def fetch(
+        self,
+        query: zodchy.codex.cqea.Query,
+        producer: collections.abc.Callable[[], collections.abc.Awaitable[list[zodchy.codex.cqea.Message]]],
+        scope: collections.abc.Hashable = None
+    ) -> list[zodchy.codex.cqea.Message]:
+        key = (query.__class__, scope, tuple((name, _hashable(value)) for name, value in query))
+        if (stream := self._cache.get(key)) is not None:
+            return list(stream)
+        return list(await self._in_flight.run(key, functools.partial(self._produce, key, query, producer)))
+
+    async def _produce(
+        self,
+        key: collections.abc.Hashable,
+        query: zodchy.codex.cqea.Query,
+        producer: collections.abc.Callable[[], collections.abc.Awaitable[list[zodchy.codex.cqea.Message]]]
+    ) -> tuple[zodchy.codex.cqea.Message, ...]:
+        generation = self._generation(query.__class__)
+        result = tuple(await producer())
+        if (
+            generation == self._generation(query.__class__)  # not invalidated while running
+            and not any(isinstance(message, zodchy.codex.cqea.Error) for message in result)
+        ):
+            self._cache.set(key, result, ttl=self._ttls.get(query.__class__))
+        return result
+
+    def notify(self, stream: collections.abc.Iterable[zodchy.codex.cqea.Message]):
+        for message in stream:
+            for query_type in self._invalidations.get(message.__class__) or ():
+                self.invalidate(query_type)
+
+    def invalidate(self, query_type: type[zodchy.codex.cqea.Query] | None = None):
+        self._generations[query_type] += 1
+        if query_type is None:
+            self._cache.clear()
+            return
+        for key in self._cache:
+            if isinstance(key, tuple) and key[0] is query_type:
+                self._cache.discard(key)
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+    def _generation(self, query_type: type[zodchy.codex.cqea.Query]) -> tuple[int, int]:
+        return self._generations[None], self._generations[query_type]
+
+
+class SingleFlight:
+    def __init__(self, keep: bool = False):
+        self._futures: dict[collections.abc.Hashable, asyncio.Future] = {}
+        self._keep = keep  # settled results answer later calls as well
+
+    async def run(
+        self,
+        key: collections.abc.Hashable,
+        producer: collections.abc.Callable[[], collections.abc.Awaitable[typing.Any]]
+    ) -> typing.Any:
+        # one producer per key at a time, concurrent callers wait for its result instead of producing it again
+        while (future := self._futures.get(key)) is not None:
+            if future.done() and not future.cancelled():
+                return future.result()
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or (task := asyncio.current_task()) is None or task.cancelling():
+                    raise
+                # only the producing caller was cancelled, a waiter takes over instead of sharing its fate
+        future = self._futures[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await producer()
+        except asyncio.CancelledError:
+            del self._futures[key]
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it, the producing caller must not leave it unretrieved
+            self._settle(key)
+            raise
+        future.set_result(result)
+        self._settle(key)
+        return result
+
+    def _settle(self, key: collections.abc.Hashable):
+        if not self._keep:
+            del self._futures[key]
+
+
+def message_key(*messages: typing.Any) -> tuple:
+    return tuple(_hashable(message) for message in messages)
+
+
+def _hashable(value: typing.Any) -> collections.abc.Hashable:
+    try:
+        hash(value)
+    except TypeError:
+        return value.__class__, repr(value)
+    return value
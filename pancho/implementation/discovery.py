@@ -0,0 +1,101 @@
+import collections.abc
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import pathlib
+import pkgutil
+import tempfile
+
+from . import registry
+
+MANIFEST_VERSION = 1
+
+
+def discover_module(
+    actor_registry: registry.ActorRegistry,
+    module: str,
+    manifest: str | os.PathLike
+) -> registry.ActorRegistry:
+    manifest = pathlib.Path(manifest)
+    cached = _read_manifest(manifest)
+    modules = {}
+    for name, path in _walk(module):
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if (record := cached.get(name)) is not None and record['hash'] == digest:
+            for actor in record['actors']:
+                actor_registry.add_lazy(
+                    registry.LazyActor(module=name, name=actor['name'], contracts=tuple(actor['contracts']))
+                )
+        else:
+            record = {'hash': digest, 'actors': list(_register(actor_registry, name))}
+        modules[name] = record
+    prefix = f'{module}.'
+    updated = {
+        name: record
+        for name, record in cached.items()
+        if name != module and not name.startswith(prefix)
+    }
+    updated.update(modules)
+    if updated != cached:
+        _write_manifest(manifest, updated)
+    return actor_registry
+
+
+def _walk(module: str) -> collections.abc.Iterator[tuple[str, pathlib.Path]]:
+    # locates sources without importing them, only parents of the root module get imported
+    spec = importlib.util.find_spec(module)
+    if spec is None:
+        raise ModuleNotFoundError(module)
+    if spec.has_location and spec.origin is not None:
+        yield module, pathlib.Path(spec.origin)
+    for location in spec.submodule_search_locations or ():
+        yield from _walk_directory(module, pathlib.Path(location))
+
+
+def _walk_directory(module: str, path: pathlib.Path) -> collections.abc.Iterator[tuple[str, pathlib.Path]]:
+    for info in pkgutil.iter_modules([str(path)], f'{module}.'):
+        name = info.name.rpartition('.')[2]
+        if info.ispkg:
+            if (init := path / name / '__init__.py').exists():
+                yield info.name, init
+            yield from _walk_directory(info.name, path / name)
+        elif (source := path / f'{name}.py').exists():
+            yield info.name, source
+
+
+def _register(
+    actor_registry: registry.ActorRegistry,
+    module: str
+) -> collections.abc.Iterator[dict]:
+    imported = importlib.import_module(module)
+    for name, entity in inspect.getmembers(imported, inspect.isfunction):
+        if name.startswith('_') or entity.__module__ != module:
+            continue
+        actor_registry.add(entity)
+        if (entry := actor_registry.get_by_id(id(entity))) is not None:
+            yield {
+                'name': name,
+                'contracts': sorted({
+                    registry.contract_key(contract) for contract in registry.entry_contracts(entry)
+                })
+            }
+
+
+def _read_manifest(path: pathlib.Path) -> dict:
+    try:
+        content = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(content, dict) or content.get('version') != MANIFEST_VERSION:
+        return {}
+    return content.get('modules') or {}
+
+
+def _write_manifest(path: pathlib.Path, modules: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile('w', dir=path.parent, delete=False, suffix='.tmp') as file:
+        json.dump({'version': MANIFEST_VERSION, 'modules': modules}, file, indent=2, sort_keys=True)
+    os.replace(file.name, path)
@@ -0,0 +1,165 @@
+import abc
+import asyncio
+import collections.abc
+import itertools
+import multiprocessing
+import os
+import threading
+import typing
+
+
+class Request(abc.ABC):
+    def __init__(self, payload: bytes):
+        self.payload = payload
+
+    @abc.abstractmethod
+    async def reply(self, payload: bytes):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def close(self):
+        raise NotImplementedError
+
+
+class Transport(abc.ABC):
+    @abc.abstractmethod
+    def request(self, payload: bytes) -> collections.abc.AsyncGenerator[bytes, None]:
+        raise NotImplementedError
+
+
+class WorkerTransport(abc.ABC):
+    @abc.abstractmethod
+    def requests(self) -> collections.abc.AsyncIterator[Request]:
+        raise NotImplementedError
+
+
+class InMemoryBroker(Transport, WorkerTransport):
+    def __init__(self):
+        self._requests = asyncio.Queue()
+
+    async def request(self, payload: bytes) -> collections.abc.AsyncGenerator[bytes, None]:
+        replies: asyncio.Queue[bytes | None] = asyncio.Queue()
+        await self._requests.put(_InMemoryRequest(payload, replies))
+        while (frame := await replies.get()) is not None:
+            yield frame
+
+    async def requests(self) -> collections.abc.AsyncIterator[Request]:
+        while (request := await self._requests.get()) is not None:
+            yield request
+
+    def stop_workers(self, count: int = 1):
+        for _ in range(count):
+            self._requests.put_nowait(None)
+
+
+class MultiprocessingBroker(Transport, WorkerTransport):
+    _pending: dict[str, asyncio.Queue[bytes | None]]
+    _reader: threading.Thread | None
+
+    def __init__(self, context: multiprocessing.context.BaseContext | None = None):
+        context = context or multiprocessing.get_context()
+        self._requests = context.Queue()
+        self._replies = context.Queue()
+        self._setup()
+
+    def __getstate__(self):
+        return self._requests, self._replies
+
+    def __setstate__(self, state):
+        self._requests, self._replies = state
+        self._setup()
+
+    async def request(self, payload: bytes) -> collections.abc.AsyncGenerator[bytes, None]:
+        request_id = f'{os.getpid()}:{next(self._ids)}'
+        replies: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._pending[request_id] = replies
+        if self._reader is None:
+            self._reader = _pump(self._replies, self._dispatch)
+        self._requests.put((request_id, payload))
+        try:
+            while (frame := await replies.get()) is not None:
+                yield frame
+        finally:
+            del self._pending[request_id]
+
+    async def requests(self) -> collections.abc.AsyncIterator[Request]:
+        # a request is taken off the shared queue only when asked for, a busy worker leaves it to idle ones
+        received: asyncio.Queue[tuple[str, bytes] | None] = asyncio.Queue()
+        demand = threading.Semaphore(0)
+        _pump(self._requests, received.put_nowait, demand)
+        while True:
+            demand.release()
+            if (item := await received.get()) is None:
+                return
+            yield _QueueRequest(*item, self._replies)
+
+    def stop_workers(self, count: int = 1):
+        for _ in range(count):
+            self._requests.put(None)
+
+    def close(self):
+        if self._reader is not None:
+            self._replies.put(None)
+            self._reader = None
+
+    def _setup(self):
+        self._ids = itertools.count()
+        self._pending = {}
+        self._reader = None
+
+    def _dispatch(self, item: tuple[str, bytes | None] | None):
+        if item is None:
+            return
+        request_id, frame = item
+        if (replies := self._pending.get(request_id)) is not None:
+            replies.put_nowait(frame)
+
+
+class _InMemoryRequest(Request):
+    def __init__(self, payload: bytes, replies: asyncio.Queue):
+        super().__init__(payload)
+        self._replies = replies
+
+    async def reply(self, payload: bytes):
+        self._replies.put_nowait(payload)
+
+    async def close(self):
+        self._replies.put_nowait(None)
+
+
+class _QueueRequest(Request):
+    def __init__(self, request_id: str, payload: bytes, replies: multiprocessing.Queue):
+        super().__init__(payload)
+        self._id = request_id
+        self._replies = replies
+
+    async def reply(self, payload: bytes):
+        self._replies.put((self._id, payload))
+
+    async def close(self):
+        self._replies.put((self._id, None))
+
+
+def _pump(
+    source: multiprocessing.Queue,
+    callback: collections.abc.Callable[[typing.Any], typing.Any],
+    demand: threading.Semaphore | None = None
+) -> threading.Thread:
+    # a daemon thread instead of the default executor, a blocked get must not hold the loop shutdown
+    loop = asyncio.get_running_loop()
+
+    def pump():
+        while True:
+            if demand is not None:
+                demand.acquire()
+            item = source.get()
+            try:
+                loop.call_soon_threadsafe(callback, item)
+            except RuntimeError:
+                return  # the loop is closed
+            if item is None:
+                return
+
+    thread = threading.Thread(target=pump, daemon=True)
+    thread.start()
+    return thread
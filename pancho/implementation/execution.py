@@ -1,45 +1,478 @@
+import asyncio
 import collections.abc
+import concurrent.futures
+import contextlib
+import logging
+import pickle
+import typing
 
 import zorge
 import zodchy
 
-from . import registry, processing
+from ..definition import exceptions
+from . import registry, processing, planning, caching, instrumentation, scheduling, guarding, distribution
+
+_logger = logging.getLogger(__name__)
 
 
 class ExpectedErrorOccurred(Exception):
     pass
 
 
+class ExecutorPool(collections.abc.Mapping):
+    def __init__(
+        self,
+        thread_pool_size: int | None = None,
+        process_pool_size: int | None = None
+    ):
+        self._factories = {
+            registry.ActorExecutionPolicy.THREAD: lambda: concurrent.futures.ThreadPoolExecutor(thread_pool_size),
+            registry.ActorExecutionPolicy.PROCESS: lambda: concurrent.futures.ProcessPoolExecutor(process_pool_size),
+        }
+        self._executors: dict[registry.ActorExecutionPolicy, concurrent.futures.Executor] = {}
+
+    def __getitem__(self, policy: registry.ActorExecutionPolicy) -> concurrent.futures.Executor:
+        if (executor := self._executors.get(policy)) is None:
+            executor = self._executors[policy] = self._factories[policy]()
+        return executor
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self):
+        return len(self._factories)
+
+    def shutdown(self, wait: bool = True):
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+        self._executors.clear()
+
+
+class DeferredQueue:
+    def __init__(
+        self,
+        runner: collections.abc.Callable[..., collections.abc.Awaitable[typing.Any]],
+        maxsize: int = 1024,
+        concurrency: int = 1,
+        retries: int = 3,
+        retry_delay: float = 0.1,
+        error_handler: collections.abc.Callable[[Exception], typing.Any] | None = None
+    ):
+        self._runner = runner
+        self._maxsize = maxsize
+        self._concurrency = concurrency
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._error_handler = error_handler
+        self._queue: asyncio.Queue[tuple] | None = None
+        self._workers: list[asyncio.Task] = []
+        self.failed = 0
+
+    async def put(self, *args: typing.Any):
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._maxsize)
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self._concurrency)]
+        await self._queue.put(args)  # waits for a free place when the queue is full
+
+    async def drain(self):
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        await self.drain()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queue = None
+        self._workers = []
+
+    def __len__(self):
+        return 0 if self._queue is None else self._queue.qsize()
+
+    async def _work(self):
+        while True:
+            args = await self._queue.get()
+            try:
+                await self._run(args)
+            except Exception:
+                _logger.exception('Deferred job failed')  # a dead worker would leave drain waiting forever
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, args: tuple):
+        for attempt in range(self._retries + 1):
+            try:
+                await self._runner(*args)
+                return
+            except Exception as e:
+                if attempt < self._retries:
+                    await asyncio.sleep(self._retry_delay * 2 ** attempt)
+                    continue
+                self.failed += 1
+                if self._error_handler is not None:
+                    try:
+                        self._error_handler(e)
+                    except Exception:
+                        _logger.exception('Deferred error handler failed')
+
+
 class TaskExecutor:
     def __init__(
         self,
         di_container: zorge.Container,
         actor_registry: registry.ActorRegistry,
-        error_wrapper: collections.abc.Callable[[Exception], zodchy.codex.cqea.Error] | None = None
+        error_wrapper: collections.abc.Callable[[Exception], zodchy.codex.cqea.Error] | None = None,
+        concurrent: bool = False,
+        planner: planning.ExecutionPlanner | None = None,
+        execution_policies: collections.abc.Mapping[
+            registry.ActorSemanticKind, registry.ActorExecutionPolicy
+        ] | None = None,
+        thread_pool_size: int | None = None,
+        process_pool_size: int | None = None,
+        transient_dependencies: collections.abc.Collection[typing.Any] = (),
+        query_cache: caching.QueryCache | None = None,
+        instrumentation: instrumentation.Instrumentation | None = None,
+        multiple_instances: bool = False,
+        timeouts: collections.abc.Mapping[registry.ActorSemanticKind, float] | None = None,
+        deferred_queue_size: int = 1024,
+        deferred_concurrency: int = 1,
+        deferred_retries: int = 3,
+        deferred_retry_delay: float = 0.1,
+        deferred_error_handler: collections.abc.Callable[[Exception], typing.Any] | None = None,
+        scheduler: scheduling.TaskScheduler | None = None,
+        dependency_guards: collections.abc.Mapping[typing.Any, collections.abc.Sequence[guarding.Guard]] | None = None,
+        job_transport: distribution.Transport | None = None
     ):
         self._di_container = di_container
         self._actor_registry = actor_registry
         self._error_wrapper = error_wrapper
+        self._concurrent = concurrent
+        self._planner = planner
+        self._execution_policies = execution_policies
+        processing.check_execution_policies(actor_registry, execution_policies or {})
+        self._executors = ExecutorPool(thread_pool_size, process_pool_size)
+        self._transient_dependencies = transient_dependencies
+        self._query_cache = query_cache
+        self._instrumentation = instrumentation
+        self._multiple_instances = multiple_instances
+        self._timeouts = timeouts
+        self._scheduler = scheduler
+        self._dependency_guards = dependency_guards
+        self._remote = RemoteTaskExecutor(job_transport) if job_transport else None
+        self._deferred = DeferredQueue(
+            self._run_deferred,
+            maxsize=deferred_queue_size,
+            concurrency=deferred_concurrency,
+            retries=deferred_retries,
+            retry_delay=deferred_retry_delay,
+            error_handler=deferred_error_handler
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._deferred.close()
+        self.shutdown()
+
+    async def drain(self):
+        await self._deferred.drain()
+
+    def shutdown(self, wait: bool = True):
+        self._executors.shutdown(wait=wait)
 
     async def run(
         self,
         task: zodchy.codex.cqea.Task,
-        execution_context: registry.ExecutionContext | None = None
+        execution_context: registry.ExecutionContext | None = None,
+        timeout: float | None = None,
+        deadline: float | None = None
     ) -> list[zodchy.codex.cqea.Message]:
+        deadline = _deadline(timeout, deadline)
+        if self._query_cache is not None and isinstance(task, zodchy.codex.cqea.Query):
+            return await self._query_cache.fetch(
+                task,
+                lambda: self._run(task, execution_context, deadline=deadline),
+                caching.message_key(*sorted((execution_context or {}).items()))
+            )
+        return await self._run(task, execution_context, deadline=deadline)
+
+    async def stream(
+        self,
+        task: zodchy.codex.cqea.Task,
+        execution_context: registry.ExecutionContext | None = None,
+        timeout: float | None = None,
+        deadline: float | None = None
+    ) -> collections.abc.AsyncGenerator[zodchy.codex.cqea.Message, None]:
         resolver_context = (execution_context,) if execution_context else ()
-        stream = []
+        deadline = _deadline(timeout, deadline)
         try:
-            async with self._di_container.get_resolver(*resolver_context) as resolver:
-                processor = processing.CQProcessor(self._actor_registry, resolver)(task)
-                async for message in processor:
-                    stream.append(message)
+            async with (
+                self._scheduler.slot(task) if self._scheduler else contextlib.nullcontext(),
+                self._di_container.get_resolver(*resolver_context) as resolver
+            ):
+                async for message in self._processor(resolver, deadline, execution_context)(task):
+                    if self._query_cache is not None:
+                        self._query_cache.notify((message,))
+                    yield message
                     if isinstance(message, zodchy.codex.cqea.Error):
                         raise ExpectedErrorOccurred  # raise error just for informing context manager
         except ExpectedErrorOccurred:
             pass  # supress this artificial error
         except Exception as e:
             if self._error_wrapper:
-                stream.append(self._error_wrapper(e))
+                yield self._error_wrapper(e)
+            else:
+                raise e
+
+    async def _run(
+        self,
+        task: zodchy.codex.cqea.Task,
+        execution_context: registry.ExecutionContext | None = None,
+        deadline: float | None = None
+    ) -> list[zodchy.codex.cqea.Message]:
+        return [message async for message in self.stream(task, execution_context, deadline=deadline)]
+
+    def _processor(
+        self,
+        resolver: zodchy.codex.di.DIResolverContract,
+        deadline: float | None = None,
+        execution_context: registry.ExecutionContext | None = None,
+        dispatch_remote: bool = True
+    ) -> processing.CQProcessor:
+        remote = self._remote if dispatch_remote else None
+        return processing.CQProcessor(
+            self._actor_registry,
+            resolver,
+            concurrent=self._concurrent,
+            planner=self._planner,
+            executors=self._executors,
+            execution_policies=self._execution_policies,
+            transient_dependencies=self._transient_dependencies,
+            instrumentation=self._instrumentation,
+            multiple_instances=self._multiple_instances,
+            timeouts=self._timeouts,
+            deadline=deadline,
+            dependency_guards=self._dependency_guards,
+            remote=(lambda job: remote.run_job(job, execution_context)) if remote else None,
+            defer=lambda job: self._deferred.put(job, execution_context),
+            batch_scope=self._di_container.get_resolver  # shared by several tasks, so without their context
+        )
+
+    async def run_job(
+        self,
+        actor: zodchy.codex.cqea.Actor,
+        arguments: collections.abc.Mapping[str, typing.Any],
+        execution_context: registry.ExecutionContext | None = None
+    ) -> list[zodchy.codex.cqea.Message]:
+        if (entry := self._actor_registry.freeze().get_by_id(id(actor))) is None:
+            raise exceptions.ActorReferenceNotResolvable(repr(actor))
+        job = processing.Job(
+            tier=0,
+            priority=0,
+            actor_entry=entry,
+            arguments=tuple((name, processing.MessageSlot(message)) for name, message in arguments.items())
+        )
+        resolver_context = (execution_context,) if execution_context else ()
+        async with self._di_container.get_resolver(*resolver_context) as resolver:
+            return list(await self._processor(resolver, dispatch_remote=False).execute(job))
+
+    async def _run_deferred(
+        self,
+        job: processing.Job,
+        execution_context: registry.ExecutionContext | None = None
+    ):
+        resolver_context = (execution_context,) if execution_context else ()
+        async with self._di_container.get_resolver(*resolver_context) as resolver:
+            result = await self._processor(resolver, dispatch_remote=False).execute(job)
+        for message in result:
+            if isinstance(message, zodchy.codex.cqea.Error):
+                raise exceptions.DeferredActorFailed(job.actor_entry.id, message)
+
+    async def run_many(
+        self,
+        tasks: collections.abc.Iterable[zodchy.codex.cqea.Task] | collections.abc.AsyncIterable[zodchy.codex.cqea.Task],
+        concurrency: int = 16,
+        execution_context: registry.ExecutionContext | None = None
+    ) -> list[list[zodchy.codex.cqea.Message]]:
+        return [
+            stream
+            async for _, stream in self.stream_many(tasks, concurrency, True, execution_context)
+        ]
+
+    async def stream_many(
+        self,
+        tasks: collections.abc.Iterable[zodchy.codex.cqea.Task] | collections.abc.AsyncIterable[zodchy.codex.cqea.Task],
+        concurrency: int = 16,
+        ordered: bool = False,
+        execution_context: registry.ExecutionContext | None = None
+    ) -> collections.abc.AsyncGenerator[tuple[zodchy.codex.cqea.Task, list[zodchy.codex.cqea.Message]], None]:
+        source = _iterate(tasks)
+        pending: dict[asyncio.Future, tuple[int, zodchy.codex.cqea.Task]] = {}
+        completed = {}
+        submitted = 0
+        yielded = 0
+        exhausted = False
+        try:
+            while True:
+                # in ordered mode completed but not yet yielded results also occupy the window
+                while not exhausted and (submitted - yielded if ordered else len(pending)) < concurrency:
+                    try:
+                        task = await anext(source)
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending[asyncio.ensure_future(self.run(task, execution_context))] = (submitted, task)
+                        submitted += 1
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: pending[f][0]):
+                    index, task = pending.pop(future)
+                    if ordered:
+                        completed[index] = (task, future.result())
+                    else:
+                        yielded += 1
+                        yield task, future.result()
+                while yielded in completed:
+                    yield completed.pop(yielded)
+                    yielded += 1
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class RemoteTaskExecutor:
+    def __init__(
+        self,
+        transport: distribution.Transport,
+        error_wrapper: collections.abc.Callable[[Exception], zodchy.codex.cqea.Error] | None = None
+    ):
+        self._transport = transport
+        self._error_wrapper = error_wrapper
+
+    async def run(
+        self,
+        task: zodchy.codex.cqea.Task,
+        execution_context: registry.ExecutionContext | None = None
+    ) -> list[zodchy.codex.cqea.Message]:
+        return [message async for message in self.stream(task, execution_context)]
+
+    async def stream(
+        self,
+        task: zodchy.codex.cqea.Task,
+        execution_context: registry.ExecutionContext | None = None
+    ) -> collections.abc.AsyncGenerator[zodchy.codex.cqea.Message, None]:
+        try:
+            async for message in self._request(_TASK, task, _context(execution_context)):
+                yield message
+        except Exception as e:
+            if self._error_wrapper:
+                yield self._error_wrapper(e)
             else:
                 raise e
-        return stream
+
+    async def run_job(
+        self,
+        job: processing.Job,
+        execution_context: registry.ExecutionContext | None = None
+    ) -> list[zodchy.codex.cqea.Message]:
+        async with contextlib.aclosing(self._request(
+            _JOB,
+            registry.actor_reference(job.actor_entry),
+            tuple((name, slot.message) for name, slot in job.arguments),
+            _context(execution_context)
+        )) as messages:
+            return [message async for message in messages]
+
+    async def _request(self, *request: typing.Any) -> collections.abc.AsyncGenerator[zodchy.codex.cqea.Message, None]:
+        # closed right away on cancellation, so the transport drops the pending request
+        async with contextlib.aclosing(self._transport.request(_encode(request))) as frames:
+            async for frame in frames:
+                kind, value = pickle.loads(frame)
+                if kind == _ERROR:
+                    raise value
+                yield value
+
+
+class TaskWorker:
+    def __init__(
+        self,
+        executor: TaskExecutor,
+        transport: distribution.WorkerTransport,
+        concurrency: int = 16
+    ):
+        self._executor = executor
+        self._transport = transport
+        self._concurrency = concurrency
+
+    async def serve(self):
+        semaphore = asyncio.Semaphore(self._concurrency)
+        requests = aiter(self._transport.requests())
+        async with asyncio.TaskGroup() as task_group:
+            while True:
+                await semaphore.acquire()  # the next request is pulled only with a free slot
+                try:
+                    request = await anext(requests)
+                except StopAsyncIteration:
+                    break
+                task_group.create_task(self._handle(request)).add_done_callback(lambda _: semaphore.release())
+
+    async def _handle(self, request: distribution.Request):
+        try:
+            kind, *arguments = pickle.loads(request.payload)
+            if kind == _TASK:
+                task, execution_context = arguments
+                async for message in self._executor.stream(task, execution_context):
+                    await request.reply(_encode((_MESSAGE, message)))
+            else:
+                reference, messages, execution_context = arguments
+                for message in await self._executor.run_job(
+                    registry.resolve_reference(*reference), dict(messages), execution_context
+                ):
+                    await request.reply(_encode((_MESSAGE, message)))
+        except Exception as e:
+            await request.reply(_encode_error(e))
+        finally:
+            await request.close()
+
+
+_TASK = 'task'
+_JOB = 'job'
+_MESSAGE = 'message'
+_ERROR = 'error'
+
+
+def _encode(value: typing.Any) -> bytes:
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _encode_error(error: Exception) -> bytes:
+    try:
+        frame = _encode((_ERROR, error))
+        pickle.loads(frame)  # exceptions with custom constructors do not survive the round trip
+    except Exception:
+        frame = _encode((_ERROR, RuntimeError(f'{error.__class__.__name__}: {error}')))
+    return frame
+
+
+def _context(execution_context: registry.ExecutionContext | None) -> dict | None:
+    return dict(execution_context) if execution_context else None
+
+
+async def _iterate(
+    items: collections.abc.Iterable | collections.abc.AsyncIterable
+) -> collections.abc.AsyncIterator:
+    if isinstance(items, collections.abc.AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def _deadline(timeout: float | None, deadline: float | None) -> float | None:
+    if timeout is None:
+        return deadline
+    expires_at = asyncio.get_running_loop().time() + timeout
+    return expires_at if deadline is None else min(expires_at, deadline)
@@ -0,0 +1,145 @@
+import abc
+import asyncio
+import collections.abc
+import enum
+import time
+import typing
+
+import zodchy
+
+from ..definition import contracts
+
+GuardedCall: typing.TypeAlias = collections.abc.Callable[
+    [], collections.abc.Awaitable[collections.abc.Iterable[zodchy.codex.cqea.Message]]
+]
+
+
+class CircuitState(enum.Enum):
+    CLOSED = enum.auto()
+    OPEN = enum.auto()
+    HALF_OPEN = enum.auto()
+
+
+class Guard(abc.ABC):
+    def __init__(self, error: zodchy.codex.cqea.Error):
+        self._error = error
+
+    @abc.abstractmethod
+    async def run(self, call: GuardedCall) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+        raise NotImplementedError
+
+    def _reject(self) -> tuple[zodchy.codex.cqea.Error]:
+        return self._error,
+
+
+class ConcurrencyLimit(Guard):
+    def __init__(
+        self,
+        limit: int,
+        max_waiting: int = 0,
+        error: zodchy.codex.cqea.Error | None = None
+    ):
+        super().__init__(error or contracts.Error(status_code=503, message='Concurrency limit exceeded'))
+        self._semaphore = asyncio.Semaphore(limit)
+        self._max_waiting = max_waiting
+        self._waiting = 0
+
+    async def run(self, call: GuardedCall) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+        if self._semaphore.locked():
+            if self._waiting >= self._max_waiting:
+                return self._reject()
+            self._waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self._waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        try:
+            return await call()
+        finally:
+            self._semaphore.release()
+
+
+class RateLimit(Guard):
+    def __init__(
+        self,
+        rate: float,
+        burst: int | None = None,
+        error: zodchy.codex.cqea.Error | None = None,
+        clock: collections.abc.Callable[[], float] = time.monotonic
+    ):
+        super().__init__(error or contracts.Error(status_code=429, message='Rate limit exceeded'))
+        self._rate = rate
+        self._burst = max(1, int(rate)) if burst is None else burst
+        self._clock = clock
+        self._tokens = float(self._burst)
+        self._updated_at = clock()
+
+    async def run(self, call: GuardedCall) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+        now = self._clock()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+        if self._tokens < 1:
+            return self._reject()
+        self._tokens -= 1
+        return await call()
+
+
+class CircuitBreaker(Guard):
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        error: zodchy.codex.cqea.Error | None = None,
+        clock: collections.abc.Callable[[], float] = time.monotonic
+    ):
+        super().__init__(error or contracts.Error(status_code=503, message='Circuit breaker is open'))
+        self._failure_threshold = failure_threshold
+        self._recovery_time = recovery_time
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._recovery_time:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    async def run(self, call: GuardedCall) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+        state = self.state
+        if state is CircuitState.OPEN or (state is CircuitState.HALF_OPEN and self._probing):
+            return self._reject()
+        if probe := state is CircuitState.HALF_OPEN:
+            self._probing = True
+        try:
+            result = tuple(await call())
+        except Exception:
+            self._record(probe, failed=True)
+            raise
+        except BaseException:
+            if probe:
+                self._probing = False
+            raise
+        self._record(probe, failed=any(_is_failure(message) for message in result))
+        return result
+
+    def _record(self, probe: bool, failed: bool):
+        if probe:
+            self._probing = False
+        if not failed:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            return
+        self._failures += 1
+        if probe or self._failures >= self._failure_threshold:
+            self._state = CircuitState.OPEN
+            self._opened_at = self._clock()
+
+
+def _is_failure(message: zodchy.codex.cqea.Message) -> bool:
+    # domain errors are regular outcomes, only server side statuses count against the downstream
+    return isinstance(message, zodchy.codex.cqea.Error) and (getattr(message, 'status_code', None) or 0) >= 500
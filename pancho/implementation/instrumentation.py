@@ -0,0 +1,131 @@
+import collections
+import collections.abc
+import dataclasses
+import math
+
+from . import registry
+
+
+@dataclasses.dataclass(frozen=True)
+class ActorMeasurement:
+    actor_id: registry.ActorIdType
+    actor_name: str
+    semantic_kind: registry.ActorSemanticKind
+    wall_time: float
+    cpu_time: float
+    messages: int
+    error: BaseException | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class ActorStats:
+    actor_name: str
+    semantic_kind: registry.ActorSemanticKind
+    calls: int
+    errors: int
+    messages: int
+    scheduled: int
+    wall_time: collections.abc.Mapping[float, float]
+    cpu_time: collections.abc.Mapping[float, float]
+    dependencies_time: collections.abc.Mapping[float, float]
+
+
+class Instrumentation:
+    def job_scheduled(self, actor_entry: registry.ActorRegistryEntry):
+        pass
+
+    def dependencies_resolved(self, actor_entry: registry.ActorRegistryEntry, wall_time: float):
+        pass
+
+    def actor_executed(self, measurement: ActorMeasurement):
+        pass
+
+
+class MetricsAggregator(Instrumentation):
+    def __init__(
+        self,
+        window: int = 10000,
+        quantiles: collections.abc.Sequence[float] = (0.5, 0.9, 0.99)
+    ):
+        self._window = window
+        self._quantiles = tuple(quantiles)
+        self._actors: dict[registry.ActorIdType, _ActorMetrics] = {}
+
+    def job_scheduled(self, actor_entry: registry.ActorRegistryEntry):
+        self._metrics(actor_entry.id, actor_name(actor_entry), actor_entry.semantic_kind).scheduled += 1
+
+    def dependencies_resolved(self, actor_entry: registry.ActorRegistryEntry, wall_time: float):
+        self._metrics(
+            actor_entry.id, actor_name(actor_entry), actor_entry.semantic_kind
+        ).dependencies_time.append(wall_time)
+
+    def actor_executed(self, measurement: ActorMeasurement):
+        metrics = self._metrics(measurement.actor_id, measurement.actor_name, measurement.semantic_kind)
+        metrics.calls += 1
+        metrics.messages += measurement.messages
+        metrics.wall_time.append(measurement.wall_time)
+        metrics.cpu_time.append(measurement.cpu_time)
+        if measurement.error is not None:
+            metrics.errors += 1
+
+    def snapshot(self) -> list[ActorStats]:
+        return [
+            ActorStats(
+                actor_name=metrics.actor_name,
+                semantic_kind=metrics.semantic_kind,
+                calls=metrics.calls,
+                errors=metrics.errors,
+                messages=metrics.messages,
+                scheduled=metrics.scheduled,
+                wall_time=self._percentiles(metrics.wall_time),
+                cpu_time=self._percentiles(metrics.cpu_time),
+                dependencies_time=self._percentiles(metrics.dependencies_time),
+            )
+            for metrics in self._actors.values()
+        ]
+
+    def reset(self):
+        self._actors.clear()
+
+    def _metrics(
+        self,
+        actor_id: registry.ActorIdType,
+        name: str,
+        semantic_kind: registry.ActorSemanticKind
+    ) -> '_ActorMetrics':
+        if (metrics := self._actors.get(actor_id)) is None:
+            metrics = self._actors[actor_id] = _ActorMetrics(
+                actor_name=name,
+                semantic_kind=semantic_kind,
+                wall_time=collections.deque(maxlen=self._window),
+                cpu_time=collections.deque(maxlen=self._window),
+                dependencies_time=collections.deque(maxlen=self._window),
+            )
+        return metrics
+
+    def _percentiles(self, samples: collections.abc.Collection[float]) -> dict[float, float]:
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+        return {
+            q: ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+            for q in self._quantiles
+        }
+
+
+@dataclasses.dataclass
+class _ActorMetrics:
+    actor_name: str
+    semantic_kind: registry.ActorSemanticKind
+    wall_time: collections.deque
+    cpu_time: collections.deque
+    dependencies_time: collections.deque
+    calls: int = 0
+    errors: int = 0
+    messages: int = 0
+    scheduled: int = 0
+
+
+def actor_name(actor_entry: registry.ActorRegistryEntry) -> str:
+    executable = actor_entry.runtime.executable
+    return f'{executable.__module__}.{executable.__qualname__}'
@@ -0,0 +1,257 @@
+import collections
+import collections.abc
+import dataclasses
+import heapq
+import inspect
+import itertools
+import types
+import typing
+
+import zodchy
+
+from ..definition import contracts
+from . import registry
+
+_ABSTRACT_MESSAGE_MODULES = frozenset((
+    zodchy.codex.cqea.Message.__module__,
+    contracts.__name__,
+))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PlanStep:
+    target: registry.DispatchTarget
+    consumes: frozenset[type]
+    produces: tuple[type, ...] | None
+
+
+@dataclasses.dataclass(frozen=True)
+class ExecutionPlan:
+    task: type[zodchy.codex.cqea.Task]
+    stages: tuple[tuple[PlanStep, ...], ...]
+    context: tuple[registry.ActorRegistryEntry, ...]
+    unreachable: tuple[registry.ActorRegistryEntry, ...]
+    cyclic: tuple[registry.ActorRegistryEntry, ...]
+    complete: bool
+
+    @property
+    def width(self) -> int:
+        return max((len(stage) for stage in self.stages), default=0)
+
+    def __iter__(self) -> collections.abc.Iterator[PlanStep]:
+        return itertools.chain.from_iterable(self.stages)
+
+
+class ExecutionPlanner:
+    def __init__(
+        self,
+        actor_registry: registry.ActorRegistry | registry.CompiledActorRegistry
+    ):
+        self._actor_registry = actor_registry.freeze()
+        self._plans: dict[type[zodchy.codex.cqea.Task], ExecutionPlan] = {}
+
+    @property
+    def actor_registry(self) -> registry.CompiledActorRegistry:
+        return self._actor_registry
+
+    def plan(
+        self,
+        task: type[zodchy.codex.cqea.Task]
+    ) -> ExecutionPlan:
+        try:
+            return self._plans[task]
+        except KeyError:
+            plan = self._plans[task] = _Simulation(self._actor_registry, task).run()
+            return plan
+
+
+class _Simulation:
+    # replays Loop scheduling on message types instead of message instances
+    def __init__(
+        self,
+        actor_registry: registry.CompiledActorRegistry,
+        task: type[zodchy.codex.cqea.Task]
+    ):
+        self._actor_registry = actor_registry
+        self._task = task
+        self._available: set[type] = set()
+        self._queue: list[tuple[int, int, PlanStep]] = []
+        self._sequence = 0
+        self._touched: dict[registry.ActorIdType, registry.ActorRegistryEntry] = {}
+        self._steps: list[PlanStep] = []
+        self._producers = collections.Counter((task,))
+        self._complete = True
+
+    def run(self) -> ExecutionPlan:
+        self._register(self._task)
+        while self._queue:
+            step = heapq.heappop(self._queue)[2]
+            self._steps.append(step)
+            if step.produces is None:
+                self._complete = False
+                continue
+            if step.target.entry.semantic_kind != registry.ActorSemanticKind.AUDIT:
+                self._track_producer(step)
+            for contract in step.produces:
+                if not issubclass(contract, zodchy.codex.cqea.Error):
+                    self._register(
+                        contract,
+                        replace=step.target.entry.semantic_kind == registry.ActorSemanticKind.AUDIT
+                    )
+        executed = {step.target.entry.id for step in self._steps}
+        return ExecutionPlan(
+            task=self._task,
+            stages=self._stages(),
+            context=tuple(
+                step.target.entry
+                for step in self._steps
+                if step.target.entry.semantic_kind == registry.ActorSemanticKind.CONTEXT
+            ),
+            unreachable=tuple(
+                entry for entry_id, entry in self._touched.items() if entry_id not in executed
+            ),
+            cyclic=self._cyclic(),
+            complete=self._complete
+        )
+
+    def _track_producer(self, step: PlanStep):
+        # stages assume every output arrives right after its producer, which only holds for a single,
+        # unconditional producer, anything else is left to Loop
+        if _is_conditional(step.target.entry.return_annotation):
+            self._complete = False
+        for contract in step.produces or ():
+            if not issubclass(contract, zodchy.codex.cqea.Error):
+                self._producers[contract] += 1
+                if self._producers[contract] > 1 or self._dispatches_subclasses(contract):
+                    self._complete = False
+
+    def _dispatches_subclasses(self, contract: type) -> bool:
+        # an actor may return a subclass of its annotation, whose own actors the plan would never schedule
+        entries = self._actor_registry.plan(contract).entries
+        pending: list[type] = contract.__subclasses__()
+        while pending:
+            subclass = pending.pop()
+            if self._actor_registry.plan(subclass).entries != entries:
+                return True
+            pending.extend(subclass.__subclasses__())
+        return False
+
+    def _register(self, contract: type, replace: bool = False):
+        if replace:
+            self._available.add(contract)
+        elif contract not in self._available:
+            self._available.add(contract)
+            for target in self._actor_registry.plan(contract).targets:
+                for context_contract in target.context:
+                    self._register_context(context_contract)
+                self._enqueue(target)
+
+    def _register_context(self, contract: type[zodchy.codex.cqea.Context]):
+        if contract in self._available:
+            return
+        for target in self._actor_registry.plan(contract).providers:
+            self._enqueue(target)
+
+    def _enqueue(self, target: registry.DispatchTarget):
+        entry = target.entry
+        self._touched[entry.id] = entry
+        consumes = frozenset(_input_contracts(entry))
+        if consumes <= self._available:
+            self._sequence += 1
+            heapq.heappush(
+                self._queue,
+                (
+                    target.priority,
+                    self._sequence,
+                    PlanStep(
+                        target=target,
+                        consumes=consumes,
+                        produces=_output_contracts(entry.return_annotation)
+                    )
+                )
+            )
+
+    def _stages(self) -> tuple[tuple[PlanStep, ...], ...]:
+        stages = []
+        stage: list[PlanStep] = []
+        produced: set[type] = set()
+        for step in self._steps:
+            if stage and (
+                stage[0].target.priority != step.target.priority
+                or step.consumes & produced
+            ):
+                stages.append(tuple(stage))
+                stage = []
+                produced = set()
+            stage.append(step)
+            produced.update(step.produces or ())
+        if stage:
+            stages.append(tuple(stage))
+        return tuple(stages)
+
+    def _cyclic(self) -> tuple[registry.ActorRegistryEntry, ...]:
+        entries = list(self._touched.values())
+        produces = {
+            entry.id: set(_output_contracts(entry.return_annotation) or ())
+            for entry in entries
+            if entry.semantic_kind != registry.ActorSemanticKind.AUDIT
+        }
+        edges = {
+            entry.id: [
+                consumer.id
+                for consumer in entries
+                if produces.get(entry.id, set()) & set(_input_contracts(consumer))
+            ]
+            for entry in entries
+        }
+        cyclic = set()
+        for entry in entries:
+            visited = set()
+            pending = list(edges[entry.id])
+            while pending:
+                current = pending.pop()
+                if current == entry.id:
+                    cyclic.add(entry.id)
+                    break
+                if current not in visited:
+                    visited.add(current)
+                    pending.extend(edges[current])
+        return tuple(entry for entry in entries if entry.id in cyclic)
+
+
+def _input_contracts(entry: registry.ActorRegistryEntry) -> collections.abc.Iterator[type]:
+    for parameter in itertools.chain(entry.parameters.domain, entry.parameters.context or ()):
+        yield parameter.contract
+
+
+def _is_conditional(annotation: typing.Any) -> bool:
+    if typing.get_origin(annotation) not in (typing.Union, types.UnionType):
+        return any(_is_conditional(arg) for arg in typing.get_args(annotation))
+    arms = [
+        arg for arg in typing.get_args(annotation)
+        if not (isinstance(arg, type) and issubclass(arg, zodchy.codex.cqea.Error))
+    ]
+    return types.NoneType in arms or len(arms) > 1 or any(_is_conditional(arg) for arg in arms)
+
+
+def _output_contracts(annotation: typing.Any) -> tuple[type, ...] | None:
+    if annotation is inspect.Signature.empty:
+        return None
+    if annotation is None or annotation is types.NoneType:
+        return ()
+    if typing.get_origin(annotation) is not None:
+        result: list[type] = []
+        for arg in typing.get_args(annotation):
+            if arg is Ellipsis:
+                continue
+            if (produced := _output_contracts(arg)) is None:
+                return None
+            result.extend(produced)
+        return tuple(result)
+    if (
+        isinstance(annotation, type)
+        and issubclass(annotation, zodchy.codex.cqea.Message)
+        and annotation.__module__ not in _ABSTRACT_MESSAGE_MODULES
+    ):
+        return annotation,
+    return None
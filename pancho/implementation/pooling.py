@@ -0,0 +1,112 @@
+import asyncio
+import collections.abc
+import gc
+import multiprocessing
+import os
+import typing
+
+import zorge
+import zodchy
+
+from . import registry, execution, distribution
+
+
+class WorkerPool:
+    def __init__(
+        self,
+        actor_registry: registry.ActorRegistry | registry.CompiledActorRegistry,
+        container_factory: collections.abc.Callable[[], zorge.Container],
+        processes: int | None = None,
+        executor_options: collections.abc.Mapping[str, typing.Any] | None = None,
+        worker_concurrency: int = 16,
+        error_wrapper: collections.abc.Callable[[Exception], zodchy.codex.cqea.Error] | None = None,
+        context: multiprocessing.context.BaseContext | None = None
+    ):
+        self._actor_registry = actor_registry
+        self._container_factory = container_factory
+        self._processes = processes or os.cpu_count() or 1
+        self._executor_options = dict(executor_options or {})
+        self._worker_concurrency = worker_concurrency
+        self._context = context or _default_context()
+        self._broker = distribution.MultiprocessingBroker(self._context)
+        self._client = execution.RemoteTaskExecutor(self._broker, error_wrapper)
+        self._workers: list[multiprocessing.process.BaseProcess] = []
+
+    @property
+    def pids(self) -> list[int]:
+        return [worker.pid for worker in self._workers if worker.pid is not None]
+
+    def start(self):
+        if self._workers:
+            return
+        # everything built so far is shared copy-on-write, frozen objects stay out of the collector's way
+        self._actor_registry.freeze()
+        gc.freeze()
+        try:
+            for _ in range(self._processes):
+                worker = self._context.Process(
+                    target=_serve,
+                    args=(
+                        self._broker,
+                        self._actor_registry,
+                        self._container_factory,
+                        self._executor_options,
+                        self._worker_concurrency
+                    ),
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+        finally:
+            gc.unfreeze()
+
+    def shutdown(self, timeout: float | None = None):
+        self._broker.stop_workers(len(self._workers))
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self._workers.clear()
+        self._broker.close()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+
+    async def run(
+        self,
+        task: zodchy.codex.cqea.Task,
+        execution_context: registry.ExecutionContext | None = None
+    ) -> list[zodchy.codex.cqea.Message]:
+        return await self._client.run(task, execution_context)
+
+    def stream(
+        self,
+        task: zodchy.codex.cqea.Task,
+        execution_context: registry.ExecutionContext | None = None
+    ) -> collections.abc.AsyncGenerator[zodchy.codex.cqea.Message, None]:
+        return self._client.stream(task, execution_context)
+
+
+def _serve(
+    broker: distribution.MultiprocessingBroker,
+    actor_registry: registry.ActorRegistry | registry.CompiledActorRegistry,
+    container_factory: collections.abc.Callable[[], zorge.Container],
+    executor_options: collections.abc.Mapping[str, typing.Any],
+    concurrency: int
+):
+    async def serve():
+        async with execution.TaskExecutor(container_factory(), actor_registry, **executor_options) as executor:
+            await execution.TaskWorker(executor, broker, concurrency).serve()
+
+    asyncio.run(serve())
+
+
+def _default_context() -> multiprocessing.context.BaseContext:
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
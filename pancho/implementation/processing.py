@@ -3,182 +3,594 @@ import dataclasses
 import typing
 import heapq
 import itertools
+import asyncio
+import functools
+import time
+import concurrent.futures
+import contextlib
 
 import zodchy
 
-from ..definition import exceptions
-from . import registry
+from ..definition import contracts, exceptions
+from . import registry, planning, caching, batching, instrumentation, guarding
 
 
-@dataclasses.dataclass(order=True)
+class MessageSlot:
+    __slots__ = ('message',)
+
+    def __init__(self, message: zodchy.codex.cqea.Message):
+        self.message = message
+
+
+class MessageCollection:
+    __slots__ = ('slots',)
+
+    def __init__(self, slots: list[MessageSlot]):
+        self.slots = slots
+
+    @property
+    def message(self) -> tuple[zodchy.codex.cqea.Message, ...]:
+        return tuple(slot.message for slot in self.slots)
+
+
+@dataclasses.dataclass(order=True, slots=True)
 class Job:
+    tier: int
     priority: int
-    actor_entry: registry.ActorRegistryEntry
-    parameters: collections.abc.Mapping[str, str]
+    actor_entry: registry.ActorRegistryEntry = dataclasses.field(compare=False)
+    arguments: tuple[tuple[str, MessageSlot | MessageCollection], ...] = dataclasses.field(compare=False)
 
 
 class Stream:
-    def __init__(self):
-        self._stream = {}
+    __slots__ = ('_stream', '_multiple')
+
+    def __init__(self, multiple: bool = False):
+        self._stream: dict[type[zodchy.codex.cqea.Message], list[MessageSlot]] = {}
+        self._multiple = multiple
+
+    def insert(self, message: zodchy.codex.cqea.Message) -> MessageSlot | None:
+        if (slots := self._stream.get(message.__class__)) is None:
+            slot = MessageSlot(message)
+            self._stream[message.__class__] = [slot]
+            return slot
+        elif self._multiple:
+            slot = MessageSlot(message)
+            slots.append(slot)
+            return slot
+        return None
 
-    def insert(self, message: zodchy.codex.cqea.Message) -> bool:
-        if (key := self._key(message)) not in self._stream:
-            self._stream[key] = message
-            return True
+    def replace(
+        self,
+        message: zodchy.codex.cqea.Message,
+        slot: MessageSlot | MessageCollection | None = None
+    ):
+        if isinstance(slot, MessageSlot) and slot.message.__class__ is message.__class__:
+            slot.message = message
+        elif (slots := self._stream.get(message.__class__)) is None:
+            self._stream[message.__class__] = [MessageSlot(message)]
         else:
-            return False
+            slots[0].message = message
 
-    def replace(self, message: zodchy.codex.cqea.Message):
-        self._stream[self._key(message)] = message
+    def slot(self, contract: type[zodchy.codex.cqea.Message]) -> MessageSlot:
+        return self._stream[contract][0]
 
-    @staticmethod
-    def _key(message: zodchy.codex.cqea.Message):
-        return message.__class__.__name__
+    def slots(self, contract: type[zodchy.codex.cqea.Message]) -> list[MessageSlot]:
+        return self._stream.get(contract) or []
 
-    def __contains__(self, item: str) -> bool:
-        return item in self._stream
+    def collection(self, contract: type[zodchy.codex.cqea.Message]) -> MessageCollection:
+        return MessageCollection(self._stream[contract])
 
-    def __getitem__(self, item: str) -> zodchy.codex.cqea.Message:
-        return self._stream[item]
+    def __contains__(self, contract: type[zodchy.codex.cqea.Message]) -> bool:
+        return contract in self._stream
+
+    def __getitem__(self, contract: type[zodchy.codex.cqea.Message]) -> zodchy.codex.cqea.Message:
+        return self._stream[contract][0].message
 
 
 class Loop:
-    _SEMANTIC_PRIORITY = {
-        registry.ActorSemanticKind.CONTEXT: 0,
-        registry.ActorSemanticKind.AUDIT: 1,
-        registry.ActorSemanticKind.USECASE: 2,
-        registry.ActorSemanticKind.IO: 3,
-        registry.ActorSemanticKind.RESPONSE: 9,
-    }
+    _SEMANTIC_PRIORITY = registry.SEMANTIC_PRIORITY
 
     def __init__(
         self,
-        actor_registry: registry.ActorRegistry,
-        stream: Stream
+        actor_registry: registry.CompiledActorRegistry,
+        stream: Stream,
+        instrumentation: instrumentation.Instrumentation | None = None
     ):
         self._queue = []
         self._actor_registry = actor_registry
         self._stream = stream
         self._jobs_sequence = 0
+        self._instrumentation = instrumentation
 
-    def register(self, message: zodchy.codex.cqea.Message, replace: bool = False):
+    def register(
+        self,
+        message: zodchy.codex.cqea.Message,
+        replace: bool = False,
+        slot: MessageSlot | MessageCollection | None = None
+    ):
         if replace:
-            self._stream.replace(message)
-        elif self._stream.insert(message):
-            self._register_job(message)
-
-    def _register_job(self, message: zodchy.codex.cqea.Message):
-        is_context = isinstance(message, zodchy.codex.cqea.Context)
-        for actor_entry in self._actor_registry.get(message.__class__):
-            if (
-                is_context
-                and actor_entry.semantic_kind == registry.ActorSemanticKind.CONTEXT
-            ):
-                continue
-            for context_parameter in actor_entry.parameters.context or ():
-                self._register_context_job(context_parameter.contract)
-            self._enqueue_job(actor_entry)
+            self._stream.replace(message, slot)
+        elif (slot := self._stream.insert(message)) is not None:
+            self._register_job(slot)
+
+    def _register_job(self, trigger: MessageSlot):
+        repeated = len(self._stream.slots(trigger.message.__class__)) > 1
+        for target in self._actor_registry.plan(trigger.message.__class__).targets:
+            for contract in target.context:
+                self._register_context_job(contract)
+            self._enqueue_job(target, trigger, repeated)
 
     def _register_context_job(self, contract: type[zodchy.codex.cqea.Context]):
-        if contract.__name__ in self._stream:
+        if contract in self._stream:
             return
-        for actor_entry in self._actor_registry.get(contract):
-            if actor_entry.semantic_kind == registry.ActorSemanticKind.CONTEXT:
-                self._enqueue_job(actor_entry)
+        for target in self._actor_registry.plan(contract).providers:
+            self._enqueue_job(target)
 
-    def _enqueue_job(self, actor_entry: registry.ActorRegistryEntry):
-        if (parameters := self._build_parameters(actor_entry)) is not None:
+    def _enqueue_job(
+        self,
+        target: registry.DispatchTarget,
+        trigger: MessageSlot | None = None,
+        repeated: bool = False
+    ):
+        actor_entry = target.entry
+        if (arguments := _bind_arguments(actor_entry, self._stream, trigger, repeated)) is not None:
+            if self._instrumentation is not None:
+                self._instrumentation.job_scheduled(actor_entry)
             self._jobs_sequence += 1
             heapq.heappush(
                 self._queue,
-                (
-                    self._SEMANTIC_PRIORITY[actor_entry.semantic_kind],
-                    Job(
-                        priority=self._jobs_sequence,  # just for order jobs with the same semantic priority
-                        actor_entry=actor_entry,
-                        parameters=parameters,
-                    ),
+                Job(
+                    tier=target.priority,
+                    priority=self._jobs_sequence,  # just for order jobs with the same semantic priority
+                    actor_entry=actor_entry,
+                    arguments=arguments,
                 ),
             )
 
-    def _build_parameters(
+    async def __aiter__(self):
+        while self._queue:
+            yield heapq.heappop(self._queue)
+
+    async def batches(self, concurrent: bool = True):
+        while self._queue:
+            batch = [heapq.heappop(self._queue)]
+            if concurrent and _runs_concurrently(batch[0]):
+                while self._queue and self._queue[0].tier == batch[0].tier:
+                    batch.append(heapq.heappop(self._queue))
+            yield batch
+
+
+class PlannedLoop:
+    def __init__(
         self,
-        actor_entry: registry.ActorRegistryEntry,
+        plan: planning.ExecutionPlan,
+        stream: Stream,
+        instrumentation: instrumentation.Instrumentation | None = None
     ):
-        parameters = {}
-        for p in itertools.chain(
-            actor_entry.parameters.domain, actor_entry.parameters.context or ()
-        ):
-            if p.contract.__name__ not in self._stream:
-                return
-            parameters[p.name] = p.contract.__name__
-        return parameters
+        self._plan = plan
+        self._stream = stream
+        self._instrumentation = instrumentation
 
-    async def __aiter__(self):
-        while self._queue:
-            yield heapq.heappop(self._queue)[1]
+    def register(
+        self,
+        message: zodchy.codex.cqea.Message,
+        replace: bool = False,
+        slot: MessageSlot | MessageCollection | None = None
+    ):
+        if replace:
+            self._stream.replace(message, slot)
+        else:
+            self._stream.insert(message)
+
+    async def batches(self, concurrent: bool = True):
+        sequence = 0
+        for stage in self._plan.stages:
+            jobs = []
+            for step in stage:
+                for trigger in self._triggers(step.target.entry):
+                    if (arguments := _bind_arguments(step.target.entry, self._stream, trigger)) is not None:
+                        if self._instrumentation is not None:
+                            self._instrumentation.job_scheduled(step.target.entry)
+                        sequence += 1
+                        jobs.append(
+                            Job(
+                                tier=step.target.priority,
+                                priority=sequence,
+                                actor_entry=step.target.entry,
+                                arguments=arguments
+                            )
+                        )
+            if concurrent and jobs and _runs_concurrently(jobs[0]):
+                yield jobs
+            else:
+                for job in jobs:
+                    yield [job]
+
+    def _triggers(self, actor_entry: registry.ActorRegistryEntry) -> collections.abc.Sequence[MessageSlot | None]:
+        # a job per instance of the first single message parameter, as Loop does when messages arrive
+        for p in actor_entry.parameters.domain:
+            if not p.many:
+                return self._stream.slots(p.contract)
+        return None,
+
+
+def check_execution_policies(
+    actor_registry: registry.ActorRegistry | registry.CompiledActorRegistry,
+    execution_policies: collections.abc.Mapping[registry.ActorSemanticKind, registry.ActorExecutionPolicy]
+):
+    # fails before any job of a task runs, lazily loaded actors are still checked when scheduled
+    kinds = {kind for kind, policy in execution_policies.items() if policy is registry.ActorExecutionPolicy.PROCESS}
+    if not kinds:
+        return
+    for entry in actor_registry:
+        if entry.semantic_kind in kinds and entry.runtime.policy is None and entry.parameters.dependencies:
+            raise exceptions.ActorPolicyNotSupported(
+                actor_id=entry.id, policy=registry.ActorExecutionPolicy.PROCESS
+            )
+
+
+def _runs_concurrently(job: Job) -> bool:
+    # auditors rewrite the message the next auditor reads, so their tier stays sequential
+    return job.actor_entry.semantic_kind != registry.ActorSemanticKind.AUDIT
+
+
+def _bind_arguments(
+    actor_entry: registry.ActorRegistryEntry,
+    stream: Stream,
+    trigger: MessageSlot | None = None,
+    repeated: bool = False
+) -> tuple[tuple[str, MessageSlot | MessageCollection], ...] | None:
+    arguments: list[tuple[str, MessageSlot | MessageCollection]] = []
+    for p in itertools.chain(
+        actor_entry.parameters.domain, actor_entry.parameters.context or ()
+    ):
+        many = getattr(p, 'many', False)
+        if trigger is not None and not many and trigger.message.__class__ is p.contract:
+            arguments.append((p.name, trigger))
+            trigger = None
+        elif p.contract not in stream:
+            return None
+        elif many:
+            if repeated and trigger is not None and trigger.message.__class__ is p.contract:
+                return None  # the collection consumer was scheduled with the first instance
+            arguments.append((p.name, stream.collection(p.contract)))
+        else:
+            arguments.append((p.name, stream.slot(p.contract)))
+    return tuple(arguments)
 
 
 class CQProcessor:
     def __init__(
         self,
-        actor_registry: registry.ActorRegistry,
+        actor_registry: registry.ActorRegistry | registry.CompiledActorRegistry,
         di_resolver: zodchy.codex.di.DIResolverContract | None = None,
+        concurrent: bool = False,
+        planner: planning.ExecutionPlanner | None = None,
+        executors: collections.abc.Mapping[
+            registry.ActorExecutionPolicy, concurrent.futures.Executor
+        ] | None = None,
+        execution_policies: collections.abc.Mapping[
+            registry.ActorSemanticKind, registry.ActorExecutionPolicy
+        ] | None = None,
+        transient_dependencies: collections.abc.Collection[typing.Any] = (),
+        instrumentation: instrumentation.Instrumentation | None = None,
+        multiple_instances: bool = False,
+        timeouts: collections.abc.Mapping[registry.ActorSemanticKind, float] | None = None,
+        deadline: float | None = None,
+        defer: collections.abc.Callable[[Job], collections.abc.Awaitable[None]] | None = None,
+        dependency_guards: collections.abc.Mapping[typing.Any, collections.abc.Sequence[guarding.Guard]] | None = None,
+        remote: collections.abc.Callable[
+            [Job], collections.abc.Awaitable[collections.abc.Iterable[zodchy.codex.cqea.Message]]
+        ] | None = None,
+        batch_scope: collections.abc.Callable[
+            [], contextlib.AbstractAsyncContextManager[zodchy.codex.di.DIResolverContract]
+        ] | None = None,
     ):
-        self._actor_registry = actor_registry
+        self._actor_registry = planner.actor_registry if planner else actor_registry.freeze()
         self._di_resolver = di_resolver
+        self._concurrent = concurrent
+        self._planner = planner
+        self._executors = executors or {}
+        self._execution_policies = execution_policies or {}
+        check_execution_policies(self._actor_registry, self._execution_policies)
+        self._transient_dependencies = frozenset(transient_dependencies)
+        self._instrumentation = instrumentation
+        self._multiple_instances = multiple_instances
+        self._timeouts = timeouts or {}
+        self._deadline = deadline
+        self._defer = defer
+        self._dependency_guards = dependency_guards or {}
+        self._remote = remote
+        self._batch_scope = batch_scope
 
     async def __call__(
         self, message: zodchy.codex.cqea.Message
     ) -> typing.AsyncGenerator[zodchy.codex.cqea.Message, None]:
-        stream = Stream()
-        loop = Loop(self._actor_registry, stream)
+        stream = Stream(self._multiple_instances)
+        resolved = caching.SingleFlight(keep=True)  # dependencies live as long as the message's processing
+        plan = self._planner.plan(message.__class__) if self._planner else None
+        loop: Loop | PlannedLoop
+        if plan and plan.complete:
+            loop = PlannedLoop(plan, stream, self._instrumentation)
+        else:
+            loop = Loop(self._actor_registry, stream, self._instrumentation)
         loop.register(message)
-        async for job in loop:
-            for message in await self._run_job(job, stream):
-                yield message
-                if isinstance(message, zodchy.codex.cqea.Error):
-                    return
-                loop.register(
-                    message,
-                    replace=job.actor_entry.semantic_kind
-                            == registry.ActorSemanticKind.AUDIT,
+        async for jobs in loop.batches(self._concurrent):
+            for job, result in zip(jobs, await self._run_jobs(jobs, stream, resolved)):
+                for message in result:
+                    yield message
+                    if isinstance(message, zodchy.codex.cqea.Error):
+                        return
+                    if job.actor_entry.semantic_kind == registry.ActorSemanticKind.AUDIT:
+                        loop.register(message, replace=True, slot=job.arguments[0][1])
+                    else:
+                        loop.register(message)
+
+    async def _run_jobs(self, jobs: list[Job], stream: Stream, resolved: caching.SingleFlight):
+        if len(jobs) == 1:
+            return [await self._run_job(jobs[0], stream, resolved)]
+        # the batch runs to completion, an Error from one job stops the stream after its siblings' side effects
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [task_group.create_task(self._run_job(job, stream, resolved)) for job in jobs]
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+        return [task.result() for task in tasks]
+
+    async def execute(
+        self,
+        job: Job,
+        resolved: caching.SingleFlight | None = None
+    ) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+        resolved = caching.SingleFlight(keep=True) if resolved is None else resolved
+        guards = job.actor_entry.runtime.guards
+        if self._dependency_guards:
+            guards = (*guards, *self._guards_of_dependencies(job.actor_entry))
+        if not guards:
+            return await self._run_timed_job(job, resolved)
+        call = functools.partial(self._run_timed_job, job, resolved)
+        for guard in reversed(guards):
+            call = functools.partial(guard.run, call)
+        if self._deadline is None:
+            return await call()
+        # waiting in a guard counts towards the task deadline, the actor timeout stays inside for the guards to see
+        if self._deadline <= asyncio.get_running_loop().time():
+            return self._timeout_error(job, self._deadline),
+        try:
+            async with asyncio.timeout_at(self._deadline):
+                return await call()
+        except TimeoutError:
+            return self._timeout_error(job, self._deadline),
+
+    async def _run_timed_job(
+        self,
+        job: Job,
+        resolved: caching.SingleFlight
+    ) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+        if (expires_at := self._expires_at(job.actor_entry)) is None:
+            return await self._dispatch_job(job, resolved)
+        if expires_at <= asyncio.get_running_loop().time():
+            return self._timeout_error(job, expires_at),
+        try:
+            async with asyncio.timeout_at(expires_at):
+                return await self._dispatch_job(job, resolved)
+        except TimeoutError:
+            return self._timeout_error(job, expires_at),
+
+    async def _run_job(self, job: Job, stream: Stream, resolved: caching.SingleFlight):
+        if self._defer is not None and job.actor_entry.runtime.deferred:
+            # the stream keeps changing after the job is handed over, so its messages are pinned
+            await self._defer(dataclasses.replace(
+                job,
+                arguments=tuple((name, MessageSlot(slot.message)) for name, slot in job.arguments)
+            ))
+            return ()
+        return await self.execute(job, resolved)
+
+    async def _dispatch_job(self, job: Job, resolved: caching.SingleFlight):
+        # remote jobs stay under guards and timeouts, a timeout cancels the pending request
+        if self._remote is not None and job.actor_entry.runtime.remote:
+            if self._instrumentation is None:
+                return await self._remote(job)
+            return await self._measure(job, self._instrumentation, functools.partial(self._remote, job))
+        return await self._run_cached_job(job, resolved)
+
+    def _guards_of_dependencies(
+        self,
+        actor_entry: registry.ActorRegistryEntry
+    ) -> collections.abc.Iterator[guarding.Guard]:
+        for parameter in actor_entry.parameters.dependencies or ():
+            yield from self._dependency_guards.get(parameter.contract) or ()
+
+    def _expires_at(self, actor_entry: registry.ActorRegistryEntry) -> float | None:
+        timeout = actor_entry.runtime.timeout or self._timeouts.get(actor_entry.semantic_kind)
+        if timeout is None:
+            return self._deadline
+        expires_at = asyncio.get_running_loop().time() + timeout
+        return expires_at if self._deadline is None else min(expires_at, self._deadline)
+
+    def _timeout_error(self, job: Job, expires_at: float) -> contracts.Error:
+        if expires_at == self._deadline:
+            return contracts.Error(status_code=504, message='Task deadline exceeded')
+        return contracts.Error(
+            status_code=504,
+            message='Actor timeout exceeded',
+            details={'actor': instrumentation.actor_name(job.actor_entry)}
+        )
+
+    async def _run_cached_job(self, job: Job, resolved: caching.SingleFlight):
+        if (cache := job.actor_entry.runtime.cache) is None:
+            return await self._execute_job(job, resolved)
+        key = caching.message_key(*(slot.message for _, slot in job.arguments))
+        if (result := cache.get(key)) is None:
+            result = tuple(await self._execute_job(job, resolved))
+            if not any(isinstance(message, zodchy.codex.cqea.Error) for message in result):
+                cache.set(key, result)
+        return result
+
+    async def _execute_job(self, job: Job, resolved: caching.SingleFlight):
+        entry = job.actor_entry
+        if self._instrumentation is None and entry.runtime.batch is None:
+            dependencies = (
+                await self._dependency_values(job, self._di_resolver, resolved)
+                if entry.parameters.dependencies else ()
+            )
+            values = tuple(slot.message for _, slot in job.arguments)
+            if entry.runtime.kind == registry.ActorExecutionKind.ASYNC:
+                return await entry.runtime.invoker(values, dependencies)
+            if (policy := self._execution_policy(entry)) is registry.ActorExecutionPolicy.INLINE:
+                return entry.runtime.invoker(values, dependencies)
+            if policy is registry.ActorExecutionPolicy.THREAD:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor(entry, policy),
+                    entry.runtime.invoker,
+                    values,
+                    dependencies
+                )
+        # process pools need a picklable call, batches and instrumentation bind by name
+        messages = {name: slot.message for name, slot in job.arguments}
+        if self._instrumentation is None:
+            return await self._call_actor(
+                job, {**messages, **await self._compile_dependency_parameters(job, resolved)}
+            )
+        return await self._execute_instrumented_job(job, messages, resolved, self._instrumentation)
+
+    async def _execute_instrumented_job(
+        self,
+        job: Job,
+        messages: collections.abc.Mapping[str, zodchy.codex.cqea.Message],
+        resolved: caching.SingleFlight,
+        observer: instrumentation.Instrumentation
+    ):
+        started_at = time.perf_counter()
+        dependencies = await self._compile_dependency_parameters(job, resolved)
+        observer.dependencies_resolved(job.actor_entry, time.perf_counter() - started_at)
+        return await self._measure(
+            job, observer, functools.partial(self._call_actor, job, {**messages, **dependencies})
+        )
+
+    @staticmethod
+    async def _measure(
+        job: Job,
+        observer: instrumentation.Instrumentation,
+        call: collections.abc.Callable[[], collections.abc.Awaitable[collections.abc.Iterable[typing.Any]]]
+    ):
+        result: tuple[zodchy.codex.cqea.Message, ...] = ()
+        error = None
+        # cpu time is taken on the loop thread, so awaiting actors include other tasks' work
+        started_at, cpu_started_at = time.perf_counter(), time.thread_time()
+        try:
+            result = tuple(await call())
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            observer.actor_executed(
+                instrumentation.ActorMeasurement(
+                    actor_id=job.actor_entry.id,
+                    actor_name=instrumentation.actor_name(job.actor_entry),
+                    semantic_kind=job.actor_entry.semantic_kind,
+                    wall_time=time.perf_counter() - started_at,
+                    cpu_time=time.thread_time() - cpu_started_at,
+                    messages=len(result),
+                    error=error
                 )
+            )
+        return result
+
+    async def _call_actor(self, job: Job, params: collections.abc.Mapping[str, typing.Any]):
+        if (batch := job.actor_entry.runtime.batch) is not None:
+            return await self._call_batched_actor(job, params, batch)
+        return registry.normalize_result(job.actor_entry.runtime.executable, await self._invoke_actor(job, params))
+
+    async def _call_batched_actor(
+        self,
+        job: Job,
+        params: collections.abc.Mapping[str, typing.Any],
+        batch_window: batching.BatchWindow
+    ):
+        parameter = job.actor_entry.parameters.domain[0]
+        items = params[parameter.name] if parameter.many else (params[parameter.name],)
+
+        async def call(batch: list[zodchy.codex.cqea.Message]):
+            # the batch outlives the submitting tasks' resolvers, its dependencies come from a scope of its own
+            async with self._batch_scope() if self._batch_scope else contextlib.nullcontext() as resolver:
+                dependencies = await self._dependency_values(job, resolver, caching.SingleFlight(keep=True))
+                results = await self._invoke_actor(job, {
+                    **dict(zip((p.name for p in job.actor_entry.parameters.dependencies or ()), dependencies)),
+                    parameter.name: batch
+                })
+            if not isinstance(results, collections.abc.Sequence) or len(results) != len(batch):
+                raise exceptions.CannotProcessActorResult(actor_id=job.actor_entry.id)
+            return results
+
+        return tuple(
+            message
+            for result in await batch_window.submit(items, call)
+            for message in registry.normalize_result(job.actor_entry.runtime.executable, result)
+        )
 
-    async def _run_job(self, job: Job, stream: Stream):
-        params = {
-            **{k: stream[v] for k, v in job.parameters.items()},
-            **await self._compile_dependency_parameters(job),
-        }
+    async def _invoke_actor(self, job: Job, params: collections.abc.Mapping[str, typing.Any]):
         if job.actor_entry.runtime.kind == registry.ActorExecutionKind.ASYNC:
-            result = await job.actor_entry.runtime.executable(**params)
-        else:
-            result = job.actor_entry.runtime.executable(**params)
-
-        if result is None:
-            result =()
-        elif isinstance(result, zodchy.codex.cqea.Message):
-            result = (result,)
-        elif not isinstance(result, collections.abc.Iterable):
-            raise ValueError(
-                f"Unexpected result type for actor {job.actor_entry.runtime.executable.__name__}: {type(result)}"
+            return await job.actor_entry.runtime.executable(**params)
+        elif (policy := self._execution_policy(job.actor_entry)) is not registry.ActorExecutionPolicy.INLINE:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor(job.actor_entry, policy),
+                functools.partial(job.actor_entry.runtime.executable, **params)
             )
+        return job.actor_entry.runtime.executable(**params)
 
-        return result
+    def _execution_policy(self, actor_entry: registry.ActorRegistryEntry) -> registry.ActorExecutionPolicy:
+        return (
+            actor_entry.runtime.policy
+            or self._execution_policies.get(actor_entry.semantic_kind)
+            or registry.ActorExecutionPolicy.INLINE
+        )
+
+    def _executor(
+        self,
+        actor_entry: registry.ActorRegistryEntry,
+        policy: registry.ActorExecutionPolicy
+    ) -> concurrent.futures.Executor | None:
+        if policy is registry.ActorExecutionPolicy.PROCESS and actor_entry.parameters.dependencies:
+            raise exceptions.ActorPolicyNotSupported(actor_id=actor_entry.id, policy=policy)
+        if (executor := self._executors.get(policy)) is None and policy is registry.ActorExecutionPolicy.PROCESS:
+            raise exceptions.ActorExecutorNotConfigured(actor_id=actor_entry.id, policy=policy)
+        return executor
+
+    async def _compile_dependency_parameters(self, job: Job, resolved: caching.SingleFlight):
+        if not job.actor_entry.parameters.dependencies or job.actor_entry.runtime.batch is not None:
+            return {}  # batched actors get theirs when the batch flushes
+        return dict(zip(
+            (p.name for p in job.actor_entry.parameters.dependencies),
+            await self._dependency_values(job, self._di_resolver, resolved)
+        ))
 
-    async def _compile_dependency_parameters(self, job: Job):
-        params = {}
-        if job.actor_entry.parameters.dependencies:
-            for dependency_parameter in job.actor_entry.parameters.dependencies:
-                if self._di_resolver:
-                    params[dependency_parameter.name] = await self._di_resolver.resolve(
-                        dependency_parameter.contract
+    async def _dependency_values(
+        self,
+        job: Job,
+        resolver: zodchy.codex.di.DIResolverContract | None,
+        resolved: caching.SingleFlight
+    ) -> tuple:
+        values = []
+        for dependency_parameter in job.actor_entry.parameters.dependencies or ():
+            if resolver:
+                values.append(await self._resolve(dependency_parameter.contract, resolver, resolved))
+            else:
+                if dependency_parameter.default is zodchy.types.Empty:
+                    raise exceptions.CannotResolveActorParameter(
+                        actor_id=job.actor_entry.id,
+                        param_name=dependency_parameter.name,
                     )
-                else:
-                    if dependency_parameter.default is zodchy.types.Empty:
-                        raise exceptions.CannotResolveActorParameter(
-                            actor_id=job.actor_entry.id,
-                            param_name=dependency_parameter.name,
-                        )
-                    params[dependency_parameter.name] = dependency_parameter.default
-        return params
+                values.append(dependency_parameter.default)
+        return tuple(values)
+
+    async def _resolve(
+        self,
+        contract: typing.Any,
+        resolver: zodchy.codex.di.DIResolverContract,
+        resolved: caching.SingleFlight
+    ):
+        if contract in self._transient_dependencies:
+            return await resolver.resolve(contract)
+        return await resolved.run(contract, functools.partial(resolver.resolve, contract))
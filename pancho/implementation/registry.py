@@ -1,17 +1,25 @@
 import collections.abc
+import functools
+import importlib
 import itertools
+import os
+import pickle
 import typing
 import inspect
 import dataclasses
 import enum
+import types
 from types import ModuleType
 
 import zodchy
 
 from ..definition import exceptions
+from . import caching, batching, guarding
 
 ActorIdType: typing.TypeAlias = int
+SNAPSHOT_VERSION = 4
 ExecutionContext: typing.TypeAlias = collections.abc.Mapping[str, typing.Any]
+ActorInvoker: typing.TypeAlias = collections.abc.Callable[[tuple, tuple], typing.Any]
 
 
 class ActorExecutionKind(enum.Enum):
@@ -19,6 +27,12 @@ class ActorExecutionKind(enum.Enum):
     ASYNC = enum.auto()
 
 
+class ActorExecutionPolicy(enum.Enum):
+    INLINE = enum.auto()
+    THREAD = enum.auto()
+    PROCESS = enum.auto()
+
+
 class ActorSemanticKind(enum.Enum):
     AUDIT = enum.auto()
     USECASE = enum.auto()
@@ -27,41 +41,60 @@ class ActorSemanticKind(enum.Enum):
     RESPONSE = enum.auto()
 
 
-@dataclasses.dataclass
+SEMANTIC_PRIORITY: collections.abc.Mapping[ActorSemanticKind, int] = types.MappingProxyType({
+    ActorSemanticKind.CONTEXT: 0,
+    ActorSemanticKind.AUDIT: 1,
+    ActorSemanticKind.USECASE: 2,
+    ActorSemanticKind.IO: 3,
+    ActorSemanticKind.RESPONSE: 9,
+})
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class ActorParameter:
     name: str
     contract: typing.Any
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ActorDomainParameter(ActorParameter):
     contract: type[zodchy.codex.cqea.Message]
+    many: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ActorContextParameter(ActorParameter):
     contract: type[zodchy.codex.cqea.Context]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ActorDependencyParameter(ActorParameter):
     default: typing.Any
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ActorParameters:
     domain: collections.abc.Sequence[ActorDomainParameter]
     context: collections.abc.Sequence[ActorContextParameter] | None = None
     dependencies: collections.abc.Sequence[ActorDependencyParameter] | None = None
+    positional: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ActorRuntime:
     executable: collections.abc.Callable
     kind: ActorExecutionKind
+    invoker: ActorInvoker = dataclasses.field(compare=False, repr=False)
+    policy: ActorExecutionPolicy | None = None
+    cache: caching.MessageCache | None = None
+    timeout: float | None = None
+    deferred: bool = False
+    batch: batching.BatchWindow | None = None
+    guards: tuple[guarding.Guard, ...] = ()
+    remote: bool = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, slots=True)
 class ActorRegistryEntry:
     id: ActorIdType
     semantic_kind: ActorSemanticKind
@@ -70,18 +103,149 @@ class ActorRegistryEntry:
     runtime: ActorRuntime
 
 
+@dataclasses.dataclass(frozen=True, slots=True)
+class LazyActor:
+    module: str
+    name: str
+    contracts: tuple[str, ...]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class DispatchTarget:
+    entry: ActorRegistryEntry
+    priority: int
+    context: tuple[type[zodchy.codex.cqea.Context], ...]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class DispatchPlan:
+    entries: tuple[ActorRegistryEntry, ...]
+    targets: tuple[DispatchTarget, ...]
+    providers: tuple[DispatchTarget, ...]
+
+
+class CompiledActorRegistry:
+    def __init__(
+        self,
+        actors: collections.abc.Mapping[ActorIdType, ActorRegistryEntry],
+        contract_actor_map: collections.abc.Mapping[typing.Any, collections.abc.Sequence[ActorIdType]],
+        lazy_contracts: collections.abc.Collection[str] = (),
+        loader: collections.abc.Callable[
+            [collections.abc.Collection[str]], collections.abc.Iterable[ActorRegistryEntry]
+        ] | None = None
+    ):
+        self._actors = dict(actors)
+        self._contract_actor_map = {contract: tuple(ids) for contract, ids in contract_actor_map.items()}
+        self._lazy_contracts = set(lazy_contracts) if loader else set()
+        self._loader = loader
+        self._plans: dict[typing.Any, DispatchPlan] = {}
+        for contract in tuple(self._contract_actor_map):
+            if not self._lazy_keys(_chain(contract)):  # contracts sharing lazy keys compile, and import, on demand
+                self.plan(contract)
+
+    def plan(
+        self,
+        contract: type
+    ) -> DispatchPlan:
+        try:
+            return self._plans[contract]
+        except KeyError:
+            plan = self._plans[contract] = self._compile_plan(contract)
+            return plan
+
+    def get(
+        self,
+        contract: type
+    ) -> tuple[ActorRegistryEntry, ...]:
+        return self.plan(contract).entries
+
+    def get_by_id(
+        self,
+        actor_id: int
+    ) -> ActorRegistryEntry | None:
+        return self._actors.get(actor_id)
+
+    def freeze(self) -> typing.Self:
+        return self
+
+    def __iter__(self):
+        for entry in self._actors.values():
+            yield entry
+
+    def _compile_plan(
+        self,
+        contract: type
+    ) -> DispatchPlan:
+        chain = _chain(contract)
+        if self._lazy_contracts:
+            self._load(chain)
+        entries = tuple(
+            self._actors[entry_id]
+            for base in chain
+            for entry_id in self._contract_actor_map.get(base) or ()
+        )
+        is_context = isinstance(contract, type) and issubclass(contract, zodchy.codex.cqea.Context)
+        targets = []
+        providers = []
+        for entry in entries:
+            target = DispatchTarget(
+                entry=entry,
+                priority=SEMANTIC_PRIORITY[entry.semantic_kind],
+                context=tuple(p.contract for p in entry.parameters.context or ())
+            )
+            if entry.semantic_kind == ActorSemanticKind.CONTEXT:
+                providers.append(target)
+                if is_context:
+                    continue
+            targets.append(target)
+        return DispatchPlan(
+            entries=entries,
+            targets=tuple(targets),
+            providers=tuple(providers)
+        )
+
+    def _lazy_keys(self, chain: collections.abc.Sequence[typing.Any]) -> set[str]:
+        if not self._lazy_contracts:
+            return set()
+        return {contract_key(base) for base in chain} & self._lazy_contracts
+
+    def _load(self, chain: collections.abc.Sequence[typing.Any]):
+        keys = self._lazy_keys(chain)
+        if not keys or self._loader is None:
+            return
+        self._lazy_contracts -= keys
+        for entry in self._loader(keys):
+            if entry.id in self._actors:
+                continue
+            self._actors[entry.id] = entry
+            for contract in entry_contracts(entry):
+                self._contract_actor_map[contract] = (*self._contract_actor_map.get(contract, ()), entry.id)
+        self._plans.clear()  # plans of already compiled subclasses may miss loaded actors
+
+
 class ActorRegistry:
     def __init__(self):
         self._actors = {}
         self._contract_actor_map = collections.defaultdict(list)
+        self._lazy_actors = collections.defaultdict(list)
+        self._loaded = {}
+        self._compiled = None
 
     def add(
         self,
-        actor: zodchy.codex.cqea.Actor
+        actor: zodchy.codex.cqea.Actor,
+        policy: ActorExecutionPolicy | typing.Literal['inline', 'thread', 'process'] | None = None,
+        timeout: float | None = None,
+        deferred: bool | None = None
     ):
-        if actor_entry := self._actor_entry(actor):
+        if actor_entry := self._actor_entry(actor, policy, timeout, deferred):
             self._register_entry(actor_entry)
 
+    def add_lazy(self, actor: LazyActor):
+        self._compiled = None
+        for contract in actor.contracts:
+            self._lazy_actors[contract].append(actor)
+
     def get(
         self,
         contract: type
@@ -97,6 +261,69 @@ class ActorRegistry:
     ) -> ActorRegistryEntry | None:
         return self._actors.get(actor_id)
 
+    def freeze(self) -> CompiledActorRegistry:
+        if self._compiled is None:
+            self._compiled = CompiledActorRegistry(
+                self._actors,
+                self._contract_actor_map,
+                self._lazy_actors.keys(),
+                self._materialize
+            )
+        return self._compiled
+
+    def dump(self, file: str | os.PathLike):
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'entries': [
+                (
+                    actor_reference(entry),
+                    entry.semantic_kind,
+                    entry.parameters,
+                    entry.return_annotation,
+                    entry.runtime.kind,
+                    entry.runtime.policy,
+                    entry.runtime.timeout,
+                    entry.runtime.deferred
+                )
+                for entry in self._actors.values()
+            ],
+            'lazy': list(dict.fromkeys(itertools.chain.from_iterable(self._lazy_actors.values())))
+        }
+        with open(file, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, file: str | os.PathLike) -> typing.Self:
+        with open(file, 'rb') as f:
+            snapshot = pickle.load(f)
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f'Unsupported registry snapshot version: {snapshot.get("version")}')
+        registry = cls()
+        for reference, semantic_kind, parameters, return_annotation, kind, policy, timeout, deferred in snapshot['entries']:
+            actor = resolve_reference(*reference)
+            registry._index_entry(
+                ActorRegistryEntry(
+                    id=id(actor),
+                    semantic_kind=semantic_kind,
+                    parameters=parameters,
+                    return_annotation=return_annotation,
+                    runtime=registry._actor_runtime(
+                        actor,
+                        registry._derive_executable(actor),
+                        kind,
+                        semantic_kind,
+                        parameters,
+                        return_annotation,
+                        policy,
+                        timeout,
+                        deferred
+                    )
+                )
+            )
+        for actor in snapshot['lazy']:
+            registry.add_lazy(actor)
+        return registry
+
     def __iter__(self):
         for entry in self._actors.values():
             yield entry
@@ -104,27 +331,55 @@ class ActorRegistry:
     def __add__(self, other: typing.Self):
         for entry in other:
             self._register_entry(entry)
+        for actors in other._lazy_actors.values():
+            for actor in actors:
+                if actor not in self._lazy_actors[actor.contracts[0]]:
+                    self.add_lazy(actor)
         return self
 
     def _register_entry(
         self,
         entry: ActorRegistryEntry
+    ):
+        self._compiled = None
+        self._index_entry(entry)
+
+    def _index_entry(
+        self,
+        entry: ActorRegistryEntry
     ):
         self._actors[entry.id] = entry
-        if entry.semantic_kind == ActorSemanticKind.CONTEXT:
-            self._contract_actor_map[entry.return_annotation].append(entry.id)
-        else:
-            for parameter in itertools.chain(entry.parameters.domain, entry.parameters.context or ()):
-                self._contract_actor_map[parameter.contract].append(entry.id)
+        for contract in entry_contracts(entry):
+            self._contract_actor_map[contract].append(entry.id)
+
+    def _materialize(
+        self,
+        contracts: collections.abc.Collection[str]
+    ) -> list[ActorRegistryEntry]:
+        entries = []
+        for contract in contracts:
+            for actor in self._lazy_actors.get(contract) or ():
+                if actor not in self._loaded:
+                    module = importlib.import_module(actor.module)
+                    entry = self._loaded[actor] = self._actor_entry(getattr(module, actor.name))
+                    if entry is not None and entry.id not in self._actors:
+                        self._index_entry(entry)
+                if (entry := self._loaded[actor]) is not None:
+                    entries.append(entry)
+        return entries
 
     def _actor_entry(
         self,
-        actor: zodchy.codex.cqea.Actor
+        actor: zodchy.codex.cqea.Actor,
+        policy: ActorExecutionPolicy | str | None = None,
+        timeout: float | None = None,
+        deferred: bool | None = None
     ) -> ActorRegistryEntry | None:
         semantic_kind = self._derive_semantic_kind(actor=actor)
         if semantic_kind is None:
             return
-        signature = inspect.signature(actor)
+        executable = self._derive_executable(actor)
+        signature = _resolve_signature(actor, executable)
         parameters = self._derive_parameters(signature)
         return_annotation = signature.return_annotation
         return ActorRegistryEntry(
@@ -132,12 +387,45 @@ class ActorRegistry:
             parameters=parameters,
             return_annotation=return_annotation,
             semantic_kind=semantic_kind,
-            runtime=ActorRuntime(
-                executable=self._derive_executable(actor),
-                kind=self._derive_execution_kind(actor)
+            runtime=self._actor_runtime(
+                actor,
+                executable,
+                self._derive_execution_kind(actor),
+                semantic_kind,
+                parameters,
+                return_annotation,
+                policy,
+                timeout,
+                deferred
             )
         )
 
+    def _actor_runtime(
+        self,
+        actor: zodchy.codex.cqea.Actor,
+        executable: collections.abc.Callable,
+        kind: ActorExecutionKind,
+        semantic_kind: ActorSemanticKind,
+        parameters: ActorParameters,
+        return_annotation: typing.Any,
+        policy: ActorExecutionPolicy | str | None = None,
+        timeout: float | None = None,
+        deferred: bool | None = None
+    ) -> ActorRuntime:
+        options = _derive_options(actor)
+        return ActorRuntime(
+            executable=executable,
+            kind=kind,
+            policy=self._derive_execution_policy(actor, options, parameters, policy),
+            cache=self._derive_cache(actor, options, semantic_kind),
+            timeout=options.get('timeout') if timeout is None else timeout,
+            deferred=self._derive_deferred(actor, options, semantic_kind, deferred),
+            batch=self._derive_batch(actor, options, semantic_kind, parameters),
+            guards=tuple(options.get('guards') or ()),
+            remote=self._derive_remote(actor, options, semantic_kind),
+            invoker=_compile_invoker(executable, kind, parameters, return_annotation)
+        )
+
     @staticmethod
     def _derive_semantic_kind(
         actor: zodchy.codex.cqea.Actor,
@@ -171,6 +459,78 @@ class ActorRegistry:
 
         return execution_type
 
+    @staticmethod
+    def _derive_execution_policy(
+        actor: zodchy.codex.cqea.Actor,
+        options: collections.abc.Mapping[str, typing.Any],
+        parameters: ActorParameters,
+        policy: ActorExecutionPolicy | str | None = None
+    ) -> ActorExecutionPolicy | None:
+        _map = {
+            'inline': ActorExecutionPolicy.INLINE,
+            'thread': ActorExecutionPolicy.THREAD,
+            'process': ActorExecutionPolicy.PROCESS,
+        }
+        if policy is None:
+            policy = options.get('policy')
+        if policy is not None and not isinstance(policy, ActorExecutionPolicy):
+            policy = _map[policy]
+        if policy is ActorExecutionPolicy.PROCESS and parameters.dependencies:
+            # resolved dependencies would be pickled into the child, which fails or works on a copy
+            raise exceptions.ActorOptionNotSupported(actor, 'policy')
+        return policy
+
+    @staticmethod
+    def _derive_cache(
+        actor: zodchy.codex.cqea.Actor,
+        options: collections.abc.Mapping[str, typing.Any],
+        semantic_kind: ActorSemanticKind
+    ) -> caching.MessageCache | None:
+        cache = options.get('cache')
+        if cache is not None and semantic_kind != ActorSemanticKind.CONTEXT:
+            raise exceptions.ActorOptionNotSupported(actor, 'cache')
+        return cache
+
+    @staticmethod
+    def _derive_deferred(
+        actor: zodchy.codex.cqea.Actor,
+        options: collections.abc.Mapping[str, typing.Any],
+        semantic_kind: ActorSemanticKind,
+        deferred: bool | None = None
+    ) -> bool:
+        if deferred is None:
+            deferred = options.get('deferred', False)
+        if deferred and semantic_kind != ActorSemanticKind.IO:
+            raise exceptions.ActorOptionNotSupported(actor, 'deferred')
+        return deferred
+
+    @staticmethod
+    def _derive_batch(
+        actor: zodchy.codex.cqea.Actor,
+        options: collections.abc.Mapping[str, typing.Any],
+        semantic_kind: ActorSemanticKind,
+        parameters: ActorParameters
+    ) -> batching.BatchWindow | None:
+        batch = options.get('batch')
+        if batch is not None and (
+            semantic_kind != ActorSemanticKind.IO
+            or len(parameters.domain) != 1
+            or parameters.context
+        ):
+            raise exceptions.ActorOptionNotSupported(actor, 'batch')
+        return batch
+
+    @staticmethod
+    def _derive_remote(
+        actor: zodchy.codex.cqea.Actor,
+        options: collections.abc.Mapping[str, typing.Any],
+        semantic_kind: ActorSemanticKind
+    ) -> bool:
+        remote = bool(options.get('remote'))
+        if remote and semantic_kind != ActorSemanticKind.IO:
+            raise exceptions.ActorOptionNotSupported(actor, 'remote')
+        return remote
+
     @staticmethod
     def _derive_executable(
         actor: zodchy.codex.cqea.Actor
@@ -198,20 +558,25 @@ class ActorRegistry:
         if not domain:
             raise exceptions.CannotDefineActorParameter(signature)
         return ActorParameters(
-            domain=domain,
-            context=context or None,
-            dependencies=dependencies or None
+            domain=tuple(domain),
+            context=tuple(context) or None,
+            dependencies=tuple(dependencies) or None,
+            positional=[p.name for p in itertools.chain(domain, context, dependencies)] == [
+                p.name for p in signature.parameters.values()
+                if p.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+            ]
         )
 
     @staticmethod
     def _derive_parameter(parameter: inspect.Parameter) -> ActorParameter:
-        _types_chain = _evoke_types_chain(parameter.annotation)
-        if contract := _search_contract(_types_chain, zodchy.codex.cqea.Task, zodchy.codex.cqea.Event):
+        parameter_type, contract, many = _classify_annotation(parameter.annotation)
+        if parameter_type is ActorDomainParameter:
             return ActorDomainParameter(
                 name=parameter.name,
-                contract=contract
+                contract=contract,
+                many=many
             )
-        elif contract := _search_contract(_types_chain, zodchy.codex.cqea.Context):
+        elif parameter_type is ActorContextParameter:
             return ActorContextParameter(
                 name=parameter.name,
                 contract=contract
@@ -224,6 +589,181 @@ class ActorRegistry:
             )
 
 
+_COLLECTION_ORIGINS = frozenset((
+    list,
+    tuple,
+    collections.abc.Sequence,
+    collections.abc.Collection,
+    collections.abc.Iterable,
+))
+
+
+def normalize_result(
+    executable: collections.abc.Callable,
+    result: typing.Any
+) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+    if result is None:
+        return ()
+    elif isinstance(result, zodchy.codex.cqea.Message):
+        return result,
+    elif not isinstance(result, collections.abc.Iterable):
+        raise ValueError(
+            f"Unexpected result type for actor {executable.__name__}: {type(result)}"
+        )
+    return result
+
+
+def _compile_invoker(
+    executable: collections.abc.Callable,
+    kind: ActorExecutionKind,
+    parameters: ActorParameters,
+    return_annotation: typing.Any
+) -> ActorInvoker:
+    # invoker(messages, dependencies) with messages in domain + context order, as jobs bind them;
+    # built from partials of module level functions, so registries stay picklable for spawned workers
+    target = executable
+    if not parameters.positional:
+        target = functools.partial(_call_by_name, executable, tuple(
+            p.name for p in itertools.chain(parameters.domain, parameters.context or (), parameters.dependencies or ())
+        ))
+    is_async = kind == ActorExecutionKind.ASYNC
+    # the annotation only picks the likely case first, whatever the actor returns is normalized as on other paths
+    if isinstance(return_annotation, type) and issubclass(return_annotation, zodchy.codex.cqea.Message):
+        return functools.partial(_invoke_message_async if is_async else _invoke_message, executable, target)
+    return functools.partial(_invoke_async if is_async else _invoke, executable, target)
+
+
+def _call_by_name(executable: collections.abc.Callable, names: tuple[str, ...], *arguments: typing.Any) -> typing.Any:
+    return executable(**dict(zip(names, arguments)))
+
+
+def _invoke_message(
+    executable: collections.abc.Callable,
+    target: collections.abc.Callable,
+    messages: tuple,
+    dependencies: tuple
+) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+    if isinstance(result := target(*messages, *dependencies), zodchy.codex.cqea.Message):
+        return result,
+    return normalize_result(executable, result)
+
+
+async def _invoke_message_async(
+    executable: collections.abc.Callable,
+    target: collections.abc.Callable,
+    messages: tuple,
+    dependencies: tuple
+) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+    if isinstance(result := await target(*messages, *dependencies), zodchy.codex.cqea.Message):
+        return result,
+    return normalize_result(executable, result)
+
+
+def _invoke(
+    executable: collections.abc.Callable,
+    target: collections.abc.Callable,
+    messages: tuple,
+    dependencies: tuple
+) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+    return normalize_result(executable, target(*messages, *dependencies))
+
+
+async def _invoke_async(
+    executable: collections.abc.Callable,
+    target: collections.abc.Callable,
+    messages: tuple,
+    dependencies: tuple
+) -> collections.abc.Iterable[zodchy.codex.cqea.Message]:
+    return normalize_result(executable, await target(*messages, *dependencies))
+
+
+def _chain(contract: typing.Any) -> collections.abc.Sequence[typing.Any]:
+    return contract.__mro__ if hasattr(contract, '__mro__') else (contract,)
+
+
+def contract_key(contract: typing.Any) -> str:
+    return f'{contract.__module__}.{contract.__qualname__}'
+
+
+def entry_contracts(entry: ActorRegistryEntry) -> collections.abc.Iterator[typing.Any]:
+    if entry.semantic_kind == ActorSemanticKind.CONTEXT:
+        yield entry.return_annotation
+    else:
+        for parameter in itertools.chain(entry.parameters.domain, entry.parameters.context or ()):
+            yield parameter.contract
+
+
+def actor_reference(entry: ActorRegistryEntry) -> tuple[str, str]:
+    executable = entry.runtime.executable
+    actor = executable if inspect.isfunction(executable) else getattr(executable, '__self__')
+    module, qualname = getattr(actor, '__module__', None), getattr(actor, '__qualname__', None)
+    if module is None or qualname is None:
+        raise exceptions.ActorReferenceNotResolvable(repr(actor))
+    try:
+        resolved = resolve_reference(module, qualname)
+    except exceptions.ActorReferenceNotResolvable:
+        resolved = None
+    if resolved is not actor:
+        raise exceptions.ActorReferenceNotResolvable(repr(actor))
+    return module, qualname
+
+
+def resolve_reference(module: str, qualname: str) -> typing.Any:
+    try:
+        target = importlib.import_module(module)
+        for name in qualname.split('.'):
+            target = getattr(target, name)
+    except (ImportError, AttributeError, TypeError):
+        raise exceptions.ActorReferenceNotResolvable(f'{module}.{qualname}')
+    return target
+
+
+def _derive_options(actor: zodchy.codex.cqea.Actor) -> collections.abc.Mapping[str, typing.Any]:
+    return getattr(actor, '__dict__', {}).get('__options__') or {}
+
+
+def _resolve_signature(actor: zodchy.codex.cqea.Actor, executable: collections.abc.Callable) -> inspect.Signature:
+    signature = inspect.signature(actor)
+    if not any(
+        isinstance(annotation, str)
+        for annotation in itertools.chain(
+            (p.annotation for p in signature.parameters.values()),
+            (signature.return_annotation,)
+        )
+    ):
+        return signature
+    try:
+        hints = typing.get_type_hints(executable, include_extras=True)
+    except Exception:
+        return signature  # unresolvable names stay as written, as before
+    return signature.replace(
+        parameters=[p.replace(annotation=hints.get(p.name, p.annotation)) for p in signature.parameters.values()],
+        return_annotation=hints.get('return', signature.return_annotation)
+    )
+
+
+def _classify_annotation(
+    annotation: typing.Any
+) -> tuple[type[ActorParameter] | None, typing.Any, bool]:
+    try:
+        return _classify_hashable_annotation(annotation)
+    except TypeError:
+        return _classify(annotation)  # unhashable metadata, e.g. inside typing.Annotated
+
+
+def _classify(annotation: typing.Any) -> tuple[type[ActorParameter] | None, typing.Any, bool]:
+    _types_chain = _evoke_types_chain(annotation)
+    if contract := _search_contract(_types_chain, zodchy.codex.cqea.Task, zodchy.codex.cqea.Event):
+        return ActorDomainParameter, contract, isinstance(_types_chain, list) and _types_chain[0] in _COLLECTION_ORIGINS
+    elif contract := _search_contract(_types_chain, zodchy.codex.cqea.Context):
+        return ActorContextParameter, contract, False
+    return None, None, False
+
+
+# actors of one catalogue share a handful of message and dependency types, analyse each once
+_classify_hashable_annotation = functools.lru_cache(maxsize=4096)(_classify)
+
+
 def _evoke_types_chain(annotation):
     _origin = typing.get_origin(annotation)
     if not _origin:
@@ -0,0 +1,139 @@
+import asyncio
+import collections
+import collections.abc
+import contextlib
+import dataclasses
+
+import zodchy
+
+_STRIDE = 1 << 20
+
+
+@dataclasses.dataclass(frozen=True)
+class PriorityClass:
+    name: str
+    weight: int = 1
+    concurrency: int | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class PriorityClassStats:
+    name: str
+    weight: int
+    queued: int
+    running: int
+    completed: int
+    peak_queued: int
+
+
+class TaskScheduler:
+    def __init__(
+        self,
+        classes: collections.abc.Iterable[PriorityClass] = (),
+        routes: collections.abc.Mapping[type[zodchy.codex.cqea.Task], str] | None = None,
+        default: str = 'default',
+        concurrency: int = 64
+    ):
+        self._classes = {c.name: _ClassState(c) for c in classes}
+        if default not in self._classes:
+            self._classes[default] = _ClassState(PriorityClass(default))
+        self._routes = dict(routes or {})
+        for name in self._routes.values():
+            if name not in self._classes:
+                raise KeyError(f'Unknown priority class: {name}')
+        self._default = self._classes[default]
+        self._resolved_routes: dict[type[zodchy.codex.cqea.Task], _ClassState] = {}
+        self._concurrency = concurrency
+        self._running = 0
+        self._virtual_time = 0
+
+    @contextlib.asynccontextmanager
+    async def slot(self, task: zodchy.codex.cqea.Task) -> collections.abc.AsyncIterator[None]:
+        state = self._route(task.__class__)
+        await self._acquire(state)
+        try:
+            yield
+        finally:
+            self._release(state)
+
+    def stats(self) -> list[PriorityClassStats]:
+        return [
+            PriorityClassStats(
+                name=state.priority_class.name,
+                weight=state.priority_class.weight,
+                queued=len(state.waiters),
+                running=state.running,
+                completed=state.completed,
+                peak_queued=state.peak_queued
+            )
+            for state in self._classes.values()
+        ]
+
+    def _route(self, task_type: type[zodchy.codex.cqea.Task]) -> '_ClassState':
+        try:
+            return self._resolved_routes[task_type]
+        except KeyError:
+            state = self._default
+            for base in task_type.__mro__:
+                if (name := self._routes.get(base)) is not None:
+                    state = self._classes[name]
+                    break
+            self._resolved_routes[task_type] = state
+            return state
+
+    async def _acquire(self, state: '_ClassState'):
+        if not state.waiters:
+            # an idle class must not bank credit for the time it was not competing
+            state.pass_value = max(state.pass_value, self._virtual_time)
+        waiter = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        self._dispatch()
+        state.peak_queued = max(state.peak_queued, len(state.waiters))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if not waiter.cancelled():
+                self._release(state)  # the slot was granted in the meantime
+            elif waiter in state.waiters:
+                state.waiters.remove(waiter)
+            raise
+
+    def _release(self, state: '_ClassState'):
+        self._running -= 1
+        state.running -= 1
+        state.completed += 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._running < self._concurrency:
+            eligible = [s for s in self._classes.values() if s.waiters and self._admits(s)]
+            if not eligible:
+                return
+            state = min(eligible, key=lambda s: s.pass_value)
+            if (waiter := state.waiters.popleft()).done():
+                continue
+            self._start(state)
+            waiter.set_result(None)
+
+    def _admits(self, state: '_ClassState') -> bool:
+        return self._running < self._concurrency and (
+            state.priority_class.concurrency is None or state.running < state.priority_class.concurrency
+        )
+
+    def _start(self, state: '_ClassState'):
+        self._running += 1
+        state.running += 1
+        self._virtual_time = state.pass_value
+        state.pass_value += _STRIDE // state.priority_class.weight
+
+
+class _ClassState:
+    __slots__ = ('priority_class', 'waiters', 'running', 'completed', 'peak_queued', 'pass_value')
+
+    def __init__(self, priority_class: PriorityClass):
+        self.priority_class = priority_class
+        self.waiters: collections.deque[asyncio.Future] = collections.deque()
+        self.running = 0
+        self.completed = 0
+        self.peak_queued = 0
+        self.pass_value = 0
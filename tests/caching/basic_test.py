@@ -0,0 +1,204 @@
+import asyncio
+import dataclasses
+import datetime
+import uuid
+
+import pytest
+from zorge.implementation.container import Container as DIContainer
+
+from pancho.aux.wrappers import semantic
+from pancho.definition import exceptions, contracts
+from pancho.implementation import TaskExecutor
+from pancho.implementation.caching import MessageCache, QueryCache, SingleFlight, message_key
+from pancho.implementation.processing import CQProcessor
+from pancho.implementation.registry import ActorRegistry
+
+from ..definitions import messages, context
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_lru_eviction():
+    cache = MessageCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (3, 1, 1, 2)
+
+
+def test_cache_ttl():
+    clock = Clock()
+    cache = MessageCache(ttl=10, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=20)
+    clock.now = 15
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    clock.now = 25
+    assert cache.get('b') is None
+    assert len(cache) == 0
+
+
+def test_cache_accepts_unhashable_messages():
+    cache = MessageCache()
+    employee = messages.EmployeeStored(id=uuid.uuid4(), email='a@b.c')
+    cache.set(message_key(employee), 1)
+    assert cache.get(message_key(dataclasses.replace(employee))) == 1
+    cache.invalidate(employee)
+    assert cache.get(message_key(employee)) is None
+
+
+def test_cache_only_for_context_actors():
+    @semantic('usecase', cache=MessageCache())
+    def create_employee(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+        pass
+
+    with pytest.raises(exceptions.CannotRegisterActor):
+        ActorRegistry().add(create_employee)
+
+
+@pytest.mark.asyncio
+async def test_context_actor_cache():
+    calls = []
+    cache = MessageCache(ttl=60)
+
+    @semantic('context', cache=cache)
+    def employee_email_context(employee: messages.CreateEmployee) -> context.GenerateEmployeeEmailContext:
+        calls.append(employee)
+        return context.GenerateEmployeeEmailContext(server='example.com')
+
+    def create_employee_usecase(
+        employee: messages.CreateEmployee,
+        email_context: context.GenerateEmployeeEmailContext
+    ) -> messages.EmployeeCreated:
+        return messages.EmployeeCreated(id=uuid.uuid4(), **dataclasses.asdict(employee))
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(employee_email_context)
+    actor_registry.add(create_employee_usecase)
+    employee = messages.CreateEmployee(
+        first_name="John",
+        last_name="Doe",
+        phone="123456789",
+        birth_date=datetime.date(1978, 3, 4)
+    )
+
+    async def run():
+        return [m.__class__.__name__ async for m in CQProcessor(actor_registry)(employee)]
+
+    for _ in range(3):
+        assert await run() == ['GenerateEmployeeEmailContext', 'EmployeeCreated']
+    assert len(calls) == 1
+    cache.invalidate(employee)
+    await run()
+    assert len(calls) == 2
+    assert cache.stats().hits == 2
+
+
+@dataclasses.dataclass(frozen=True)
+class ListEmployees(contracts.Query):
+    last_name: str
+
+
+@dataclasses.dataclass(frozen=True)
+class EmployeesListed(contracts.Event):
+    count: int
+
+
+@pytest.fixture(scope="module")
+def di_container():
+    return DIContainer()
+
+
+@pytest.mark.asyncio
+async def test_query_cache(di_container):
+    calls = []
+
+    async def list_employees_reader(query: ListEmployees) -> EmployeesListed:
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return EmployeesListed(count=len(calls))
+
+    def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+        return messages.EmployeeCreated(id=uuid.uuid4(), **dataclasses.asdict(employee))
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(list_employees_reader)
+    actor_registry.add(create_employee_usecase)
+    clock = Clock()
+    query_cache = QueryCache(
+        ttls={ListEmployees: 30},
+        invalidations={messages.EmployeeCreated: (ListEmployees,)},
+        clock=clock
+    )
+    executor = TaskExecutor(di_container, actor_registry, query_cache=query_cache)
+
+    streams = await asyncio.gather(*(executor.run(ListEmployees(last_name='Doe')) for _ in range(3)))
+    assert len(calls) == 1
+    assert all(stream[-1].count == 1 for stream in streams)
+
+    await executor.run(ListEmployees(last_name='Petrov'))
+    assert (await executor.run(ListEmployees(last_name='Doe')))[-1].count == 1
+    assert len(calls) == 2
+
+    await executor.run(
+        messages.CreateEmployee(
+            first_name="John",
+            last_name="Doe",
+            phone="123456789",
+            birth_date=datetime.date(1978, 3, 4)
+        )
+    )
+    assert (await executor.run(ListEmployees(last_name='Doe')))[-1].count == 3
+
+    clock.now = 31
+    assert (await executor.run(ListEmployees(last_name='Doe')))[-1].count == 4
+
+
+@pytest.mark.asyncio
+async def test_query_cache_leader_cancellation():
+    cache = QueryCache()
+    started = asyncio.Event()
+    calls = []
+
+    async def produce():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return [EmployeesListed(count=len(calls))]
+
+    leader = asyncio.create_task(cache.fetch(ListEmployees(last_name='Doe'), produce))
+    await started.wait()
+    follower = asyncio.create_task(cache.fetch(ListEmployees(last_name='Doe'), produce))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == [EmployeesListed(count=2)]
+    assert leader.cancelled()
+
+
+@pytest.mark.parametrize('keep,expected', [(False, 2), (True, 1)])
+@pytest.mark.asyncio
+async def test_single_flight(keep, expected):
+    flights = SingleFlight(keep=keep)
+    calls = []
+
+    async def produce():
+        calls.append(True)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    assert await asyncio.gather(flights.run('key', produce), flights.run('key', produce)) == [1, 1]
+    assert await flights.run('key', produce) == expected
+    assert len(calls) == expected
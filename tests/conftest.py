@@ -0,0 +1,47 @@
+import uuid
+
+import pytest
+from zorge.implementation.container import Container as DIContainer
+
+from .definitions import depends
+
+
+class Connection:
+    def __init__(self, connection_id: int):
+        self._connection_id = connection_id
+
+    def execute(self, query: str) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_DNS, query + str(self._connection_id)))
+
+
+class ConnectionPool:
+    def __init__(self):
+        self._counter = 0
+
+    def get_connection(self) -> depends.ConnectionContract:
+        self._counter += 1
+        return Connection(self._counter)
+
+
+class EmployeeRepository:
+    def __init__(self, pool: depends.ConnectionPoolContract):
+        self._connection_pool = pool
+
+    def save(self, first_name: str, last_name: str) -> dict:
+        return {
+            'id': self._connection_pool.get_connection().execute(f'{first_name} {last_name}')
+        }
+
+
+@pytest.fixture(scope="module")
+def di_container():
+    container = DIContainer()
+    container.register_dependency(
+        implementation=ConnectionPool,
+        contract=depends.ConnectionPoolContract
+    )
+    container.register_dependency(
+        implementation=EmployeeRepository,
+        contract=depends.EmployeeRepositoryContract
+    )
+    return container
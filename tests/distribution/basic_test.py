@@ -0,0 +1,192 @@
+import asyncio
+import datetime
+import multiprocessing
+import os
+import uuid
+
+import pytest
+from zorge.implementation.container import Container as DIContainer
+
+from pancho.aux import wrappers
+from pancho.implementation import (
+    TaskExecutor,
+    RemoteTaskExecutor,
+    TaskWorker,
+    InMemoryBroker,
+    MultiprocessingBroker
+)
+from pancho.implementation.instrumentation import MetricsAggregator
+from pancho.implementation.registry import ActorRegistry
+
+from ..definitions import messages
+
+
+class EmployeeStorage:
+    name = 'local'
+
+
+class WorkerEmployeeStorage(EmployeeStorage):
+    name = 'worker'
+
+
+class StorageUnavailable(Exception):
+    pass
+
+
+def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+    if employee.first_name == 'Broken':
+        raise StorageUnavailable('Storage is unavailable')
+    return messages.EmployeeCreated(id=uuid.uuid4(), **employee.__dict__)
+
+
+@wrappers.semantic('io', remote=True)
+def employee_creation_writer(employee: messages.EmployeeCreated, storage: EmployeeStorage) -> messages.EmployeeStored:
+    return messages.EmployeeStored(id=employee.id, email=f'{storage.name}:{os.getpid()}')
+
+
+def actor_registry():
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employee_creation_writer)
+    return actor_registry
+
+
+def container(storage: type[EmployeeStorage]):
+    container = DIContainer()
+    container.register_dependency(implementation=storage, contract=EmployeeStorage)
+    return container
+
+
+def create_employee(first_name: str = 'Alex'):
+    return messages.CreateEmployee(
+        first_name=first_name,
+        last_name="Petrov",
+        phone="123456789",
+        birth_date=datetime.date(1998, 3, 4)
+    )
+
+
+def serve(broker):
+    worker = TaskWorker(TaskExecutor(container(WorkerEmployeeStorage), actor_registry()), broker)
+    asyncio.run(worker.serve())
+
+
+async def serve_in_memory(broker):
+    await TaskWorker(TaskExecutor(container(WorkerEmployeeStorage), actor_registry()), broker).serve()
+
+
+@pytest.mark.asyncio
+async def test_remote_task_execution():
+    broker = InMemoryBroker()
+    serving = asyncio.create_task(serve_in_memory(broker))
+    executor = RemoteTaskExecutor(broker)
+    created, stored = await executor.run(create_employee())
+    assert created.first_name == 'Alex'
+    assert stored.email == f'worker:{os.getpid()}'
+    with pytest.raises(StorageUnavailable):
+        await executor.run(create_employee('Broken'))
+    wrapped = await RemoteTaskExecutor(broker, error_wrapper=wrappers.default_exception).run(create_employee('Broken'))
+    assert [m.status_code for m in wrapped] == [500]
+    broker.stop_workers()
+    await serving
+
+
+@pytest.mark.asyncio
+async def test_remote_io_jobs():
+    broker = InMemoryBroker()
+    serving = asyncio.create_task(serve_in_memory(broker))
+    executor = TaskExecutor(container(EmployeeStorage), actor_registry(), job_transport=broker)
+    created, stored = await executor.run(create_employee())
+    assert stored.id == created.id
+    assert stored.email.startswith('worker:')
+    broker.stop_workers()
+    await serving
+
+
+@pytest.mark.asyncio
+async def test_multiprocessing_broker():
+    broker = MultiprocessingBroker()
+    worker = multiprocessing.Process(target=serve, args=(broker,))
+    worker.start()
+    try:
+        executor = RemoteTaskExecutor(broker)
+        streams = await asyncio.gather(*(executor.run(create_employee(str(i))) for i in range(3)))
+        for i, (created, stored) in enumerate(streams):
+            assert created.first_name == str(i)
+            assert stored.id == created.id
+            assert stored.email == f'worker:{worker.pid}'
+    finally:
+        broker.stop_workers()
+        worker.join(5)
+        broker.close()
+    assert worker.exitcode == 0
+
+
+@pytest.mark.asyncio
+async def test_multiprocessing_broker_load_distribution():
+    class FirstEmployeeStorage(EmployeeStorage):
+        name = 'first'
+
+    class SecondEmployeeStorage(EmployeeStorage):
+        name = 'second'
+
+    async def employee_creation_writer(
+        employee: messages.CreateEmployee,
+        storage: EmployeeStorage
+    ) -> messages.EmployeeStored:
+        await asyncio.sleep(0.1)
+        return messages.EmployeeStored(id=uuid.uuid4(), email=storage.name)
+
+    def worker(storage: type[EmployeeStorage]):
+        actor_registry = ActorRegistry()
+        actor_registry.add(employee_creation_writer)
+        return TaskWorker(TaskExecutor(container(storage), actor_registry), broker, concurrency=1)
+
+    broker = MultiprocessingBroker()
+    serving = [
+        asyncio.create_task(worker(storage).serve())
+        for storage in (FirstEmployeeStorage, SecondEmployeeStorage)
+    ]
+    await asyncio.sleep(0.05)
+    try:
+        executor = RemoteTaskExecutor(broker)
+        streams = await asyncio.gather(*(executor.run(create_employee(str(i))) for i in range(2)))
+        assert sorted(stored.email for stored, in streams) == ['first', 'second']
+    finally:
+        broker.stop_workers(2)
+        await asyncio.gather(*serving)
+        broker.close()
+
+
+@wrappers.semantic('io', remote=True)
+async def slow_employee_creation_writer(employee: messages.EmployeeCreated) -> messages.EmployeeStored:
+    await asyncio.sleep(1)
+    return messages.EmployeeStored(id=employee.id, email='worker')
+
+
+@pytest.mark.asyncio
+async def test_remote_io_jobs_deadline():
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(slow_employee_creation_writer)
+    broker = InMemoryBroker()
+    serving = asyncio.create_task(
+        TaskWorker(TaskExecutor(container(WorkerEmployeeStorage), actor_registry), broker).serve()
+    )
+    aggregator = MetricsAggregator()
+    executor = TaskExecutor(
+        container(EmployeeStorage),
+        actor_registry,
+        instrumentation=aggregator,
+        job_transport=broker
+    )
+    started_at = asyncio.get_running_loop().time()
+    created, error = await executor.run(create_employee(), timeout=0.2)
+    assert asyncio.get_running_loop().time() - started_at < 0.5
+    assert (error.status_code, error.message) == (504, 'Task deadline exceeded')
+    assert {s.actor_name.rsplit('.', 1)[-1]: s.calls for s in aggregator.snapshot()} == {
+        'create_employee_usecase': 1,
+        'slow_employee_creation_writer': 1
+    }
+    broker.stop_workers()
+    await serving
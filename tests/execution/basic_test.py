@@ -1,12 +1,19 @@
+import asyncio
 import datetime
 import uuid
 import dataclasses
+import os
+import threading
 
 import pytest
 from zorge.implementation.container import Container as DIContainer
 
-from pancho.implementation import TaskExecutor
-from pancho.implementation.registry import ActorRegistry
+from pancho.aux import wrappers
+from pancho.definition import exceptions
+from pancho.implementation import TaskExecutor, BatchWindow
+from pancho.implementation.execution import DeferredQueue
+from pancho.implementation.processing import CQProcessor
+from pancho.implementation.registry import ActorRegistry, ActorSemanticKind, ActorExecutionPolicy
 
 from ..definitions import messages
 
@@ -52,3 +59,458 @@ async def test_executor(actor_registry, di_container):
         'CreateEmployee',
         'EmployeeCreated'
     ]
+
+
+def blocking_employee_writer(employee: messages.EmployeeCreated) -> messages.EmployeeStored:
+    return messages.EmployeeStored(id=os.getpid(), email=threading.current_thread().name)
+
+
+@pytest.mark.parametrize('policy,thread_prefix', [
+    (None, 'MainThread'),
+    ('inline', 'MainThread'),
+    ('thread', 'ThreadPoolExecutor'),
+    ('process', 'MainThread'),
+])
+@pytest.mark.asyncio
+async def test_executor_policy(di_container, policy, thread_prefix):
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(blocking_employee_writer, policy=policy)
+    async with TaskExecutor(di_container, actor_registry) as executor:
+        stream = await executor.run(
+            messages.CreateEmployee(
+                first_name="Alex",
+                last_name="Petrov",
+                phone="123456789",
+                birth_date=datetime.date(1998, 3, 4)
+            )
+        )
+    assert stream[-1].email.startswith(thread_prefix)
+    assert (stream[-1].id == os.getpid()) is (policy != 'process')
+
+
+def test_executor_process_policy_with_dependencies():
+    def employee_storage_writer(employee: messages.EmployeeCreated, storage: EmployeeSession):
+        pass
+
+    with pytest.raises(exceptions.CannotRegisterActor):
+        ActorRegistry().add(employee_storage_writer, policy='process')
+
+    container = DIContainer()
+    container.register_dependency(EmployeeSession, EmployeeSession)
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employee_storage_writer)
+    with pytest.raises(exceptions.ActorPolicyNotSupported):
+        TaskExecutor(
+            container,
+            actor_registry,
+            execution_policies={ActorSemanticKind.IO: ActorExecutionPolicy.PROCESS}
+        )
+    with pytest.raises(exceptions.ActorPolicyNotSupported):
+        CQProcessor(actor_registry, execution_policies={ActorSemanticKind.IO: ActorExecutionPolicy.PROCESS})
+    TaskExecutor(
+        container,
+        actor_registry,
+        execution_policies={ActorSemanticKind.USECASE: ActorExecutionPolicy.PROCESS}
+    )
+
+
+@pytest.mark.asyncio
+async def test_executor_semantic_kind_policy(di_container):
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(blocking_employee_writer)
+    async with TaskExecutor(
+        di_container,
+        actor_registry,
+        execution_policies={ActorSemanticKind.IO: ActorExecutionPolicy.THREAD}
+    ) as executor:
+        stream = await executor.run(
+            messages.CreateEmployee(
+                first_name="Alex",
+                last_name="Petrov",
+                phone="123456789",
+                birth_date=datetime.date(1998, 3, 4)
+            )
+        )
+    assert stream[-1].email.startswith('ThreadPoolExecutor')
+
+
+@pytest.mark.parametrize('ordered', [False, True])
+@pytest.mark.asyncio
+async def test_executor_stream_many(di_container, ordered):
+    running = []
+    peak = []
+
+    async def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+        running.append(employee)
+        peak.append(len(running))
+        await asyncio.sleep(0.01 * (5 - len(employee.phone)))
+        running.remove(employee)
+        return messages.EmployeeCreated(id=uuid.uuid4(), **dataclasses.asdict(employee))
+
+    async def produce():
+        for i in range(5):
+            yield messages.CreateEmployee(
+                first_name="Alex",
+                last_name="Petrov",
+                phone=str(i) * (i + 1),
+                birth_date=datetime.date(1998, 3, 4)
+            )
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    executor = TaskExecutor(di_container, actor_registry)
+    phones = [
+        stream[-1].phone
+        async for _, stream in executor.stream_many(produce(), concurrency=2, ordered=ordered)
+    ]
+    assert max(peak) == 2
+    assert sorted(phones) == ['0', '11', '222', '3333', '44444']
+    if ordered:
+        assert phones == ['0', '11', '222', '3333', '44444']
+    else:
+        assert phones != ['0', '11', '222', '3333', '44444']
+
+
+@pytest.mark.asyncio
+async def test_executor_run_many(actor_registry, di_container):
+    executor = TaskExecutor(di_container, actor_registry)
+    streams = await executor.run_many(
+        [
+            messages.CreateEmployee(
+                first_name=name,
+                last_name="Petrov",
+                phone="123456789",
+                birth_date=datetime.date(1998, 3, 4)
+            )
+            for name in ('Alex', 'Ivan', 'Petr')
+        ],
+        concurrency=2
+    )
+    assert [s[-1].first_name for s in streams] == ['Alex', 'Ivan', 'Petr']
+
+
+@pytest.mark.asyncio
+async def test_executor_stream(di_container):
+    events = []
+
+    class Resolver:
+        async def __aenter__(self):
+            events.append('enter')
+            return self
+
+        async def __aexit__(self, exc_type, exc_val, exc_tb):
+            events.append(('exit', exc_type))
+
+        async def resolve(self, contract, context=None):
+            pass
+
+    class Container:
+        def get_resolver(self, *context):
+            return Resolver()
+
+    async def slow_employee_writer(employee: messages.EmployeeCreated) -> messages.EmployeeStored:
+        events.append('writer')
+        return messages.EmployeeStored(id=employee.id, email='')
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(slow_employee_writer)
+    executor = TaskExecutor(Container(), actor_registry)
+    async for message in executor.stream(
+        messages.CreateEmployee(
+            first_name="Alex",
+            last_name="Petrov",
+            phone="123456789",
+            birth_date=datetime.date(1998, 3, 4)
+        )
+    ):
+        events.append(message.__class__.__name__)
+    assert events == ['enter', 'EmployeeCreated', 'writer', 'EmployeeStored', ('exit', None)]
+
+
+@pytest.mark.asyncio
+async def test_executor_stream_error_wrapping(di_container):
+    def failing_employee_writer(employee: messages.EmployeeCreated):
+        raise RuntimeError('Storage is unavailable')
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(failing_employee_writer)
+    executor = TaskExecutor(di_container, actor_registry, error_wrapper=wrappers.default_exception)
+    stream = [
+        message async for message in executor.stream(
+            messages.CreateEmployee(
+                first_name="Alex",
+                last_name="Petrov",
+                phone="123456789",
+                birth_date=datetime.date(1998, 3, 4)
+            )
+        )
+    ]
+    assert [m.__class__.__name__ for m in stream] == ['EmployeeCreated', 'Error']
+    assert stream[-1].status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_executor_task_deadline(di_container):
+    events = []
+
+    async def hanging_employee_writer(employee: messages.EmployeeCreated) -> messages.EmployeeStored:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append('cancelled')
+            raise
+
+    def employee_stored_response(employee: messages.EmployeeStored):
+        events.append('response')
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(hanging_employee_writer)
+    actor_registry.add(employee_stored_response)
+    executor = TaskExecutor(di_container, actor_registry)
+    stream = await asyncio.wait_for(
+        executor.run(
+            messages.CreateEmployee(
+                first_name="Alex",
+                last_name="Petrov",
+                phone="123456789",
+                birth_date=datetime.date(1998, 3, 4)
+            ),
+            timeout=0.05
+        ),
+        1
+    )
+    assert [m.__class__.__name__ for m in stream] == ['EmployeeCreated', 'Error']
+    assert (stream[-1].status_code, stream[-1].message) == (504, 'Task deadline exceeded')
+    assert events == ['cancelled']
+
+
+@pytest.mark.asyncio
+async def test_executor_actor_timeouts(di_container):
+    @wrappers.semantic('io', timeout=0.05)
+    async def slow_employee_writer(employee: messages.EmployeeCreated):
+        await asyncio.sleep(10)
+
+    async def slow_employee_reader(employee: messages.EmployeeCreated):
+        await asyncio.sleep(10)
+
+    for actor, timeouts in (
+        (slow_employee_writer, None),
+        (slow_employee_reader, {ActorSemanticKind.IO: 0.05}),
+    ):
+        actor_registry = ActorRegistry()
+        actor_registry.add(create_employee_usecase)
+        actor_registry.add(actor)
+        executor = TaskExecutor(di_container, actor_registry, timeouts=timeouts)
+        stream = await asyncio.wait_for(
+            executor.run(
+                messages.CreateEmployee(
+                    first_name="Alex",
+                    last_name="Petrov",
+                    phone="123456789",
+                    birth_date=datetime.date(1998, 3, 4)
+                ),
+                timeout=5
+            ),
+            1
+        )
+        assert stream[-1].status_code == 504
+        assert stream[-1].message == 'Actor timeout exceeded'
+        assert stream[-1].details == {'actor': f'{__name__}.{actor.__qualname__}'}
+
+
+@pytest.mark.asyncio
+async def test_executor_deferred_io(di_container):
+    events = []
+
+    @wrappers.semantic('io', deferred=True)
+    async def employee_analytics_writer(employee: messages.EmployeeCreated):
+        await asyncio.sleep(0.01)
+        events.append(('analytics', employee.first_name))
+
+    def employee_created_response(employee: messages.EmployeeCreated):
+        events.append('response')
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employee_analytics_writer)
+    actor_registry.add(employee_created_response)
+    async with TaskExecutor(di_container, actor_registry) as executor:
+        stream = await executor.run(
+            messages.CreateEmployee(
+                first_name="Alex",
+                last_name="Petrov",
+                phone="123456789",
+                birth_date=datetime.date(1998, 3, 4)
+            )
+        )
+        assert [m.__class__.__name__ for m in stream] == ['EmployeeCreated']
+        assert events == ['response']
+        await executor.drain()
+        assert events == ['response', ('analytics', 'Alex')]
+        await executor.run(
+            messages.CreateEmployee(
+                first_name="Ivan",
+                last_name="Petrov",
+                phone="123456789",
+                birth_date=datetime.date(1998, 3, 4)
+            )
+        )
+    assert events[-1] == ('analytics', 'Ivan')
+
+
+@pytest.mark.asyncio
+async def test_executor_deferred_io_retries(di_container):
+    attempts = []
+    failures = []
+
+    def flaky_employee_writer(employee: messages.EmployeeCreated):
+        attempts.append(employee.first_name)
+        if employee.first_name == 'Broken' or len(attempts) < 3:
+            raise RuntimeError('Storage is unavailable')
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(flaky_employee_writer, deferred=True)
+    async with TaskExecutor(
+        di_container,
+        actor_registry,
+        deferred_retries=2,
+        deferred_retry_delay=0,
+        deferred_error_handler=failures.append
+    ) as executor:
+        for first_name in ('Alex', 'Broken'):
+            await executor.run(
+                messages.CreateEmployee(
+                    first_name=first_name,
+                    last_name="Petrov",
+                    phone="123456789",
+                    birth_date=datetime.date(1998, 3, 4)
+                )
+            )
+            await executor.drain()
+    assert attempts == ['Alex'] * 3 + ['Broken'] * 3
+    assert [str(e) for e in failures] == ['Storage is unavailable']
+
+
+@pytest.mark.asyncio
+async def test_deferred_queue_survives_failing_error_handler():
+    runs = []
+
+    async def runner(name: str):
+        runs.append(name)
+        raise RuntimeError('Storage is unavailable')
+
+    def error_handler(e: Exception):
+        raise RuntimeError('Alerting is unavailable')
+
+    queue = DeferredQueue(runner, retries=0, error_handler=error_handler)
+    await queue.put('Alex')
+    await queue.put('Ivan')
+    await asyncio.wait_for(queue.close(), 1)
+    assert runs == ['Alex', 'Ivan']
+    assert queue.failed == 2
+
+
+@pytest.mark.asyncio
+async def test_executor_batched_io(di_container):
+    for max_size, sizes in ((100, [5]), (2, [2, 2, 1])):
+        calls = []
+
+        @wrappers.semantic('io', batch=BatchWindow(max_size=max_size, max_delay=0.01))
+        async def employees_writer(employees: list[messages.EmployeeCreated]) -> list[messages.EmployeeStored]:
+            calls.append(len(employees))
+            return [messages.EmployeeStored(id=employee.id, email=employee.first_name) for employee in employees]
+
+        actor_registry = ActorRegistry()
+        actor_registry.add(create_employee_usecase)
+        actor_registry.add(employees_writer)
+        executor = TaskExecutor(di_container, actor_registry)
+        names = [f'Employee {i}' for i in range(5)]
+        streams = await executor.run_many(
+            messages.CreateEmployee(
+                first_name=name,
+                last_name="Petrov",
+                phone="123456789",
+                birth_date=datetime.date(1998, 3, 4)
+            )
+            for name in names
+        )
+        assert calls == sizes
+        for name, stream in zip(names, streams):
+            created, stored = stream
+            assert (stored.id, stored.email) == (created.id, name)
+
+
+class EmployeeSession:
+    def __init__(self):
+        self.closed = False
+
+
+def close_employee_session(session: EmployeeSession, context: dict):
+    session.closed = True
+
+
+@pytest.mark.asyncio
+async def test_executor_batched_io_dependency_scope():
+    sessions = []
+
+    @wrappers.semantic('io', batch=BatchWindow(max_delay=0.05))
+    async def employees_writer(
+        employees: list[messages.EmployeeCreated],
+        session: EmployeeSession
+    ) -> list[messages.EmployeeStored]:
+        sessions.append((session, session.closed))
+        return [messages.EmployeeStored(id=employee.id, email=employee.first_name) for employee in employees]
+
+    container = DIContainer()
+    container.register_dependency(EmployeeSession, EmployeeSession, cache_scope='resolver')
+    container.register_callback(EmployeeSession, close_employee_session)
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employees_writer)
+    executor = TaskExecutor(container, actor_registry)
+
+    def create_employee(first_name: str):
+        return messages.CreateEmployee(
+            first_name=first_name,
+            last_name="Petrov",
+            phone="123456789",
+            birth_date=datetime.date(1998, 3, 4)
+        )
+
+    # the first submitter gives up before the batch is written, the other task's item must still be stored
+    expired, stored = await asyncio.gather(
+        executor.run(create_employee('Alex'), timeout=0.01),
+        executor.run(create_employee('Ivan'))
+    )
+    assert expired[-1].message == 'Task deadline exceeded'
+    assert stored[-1].email == 'Ivan'
+    [(session, closed)] = sessions
+    assert not closed and session.closed
+
+@pytest.mark.asyncio
+async def test_executor_batched_io_failure(di_container):
+    @wrappers.semantic('io', batch=BatchWindow(max_delay=0.01))
+    async def employees_writer(employees: list[messages.EmployeeCreated]):
+        return [None]
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employees_writer)
+    executor = TaskExecutor(di_container, actor_registry, error_wrapper=wrappers.default_exception)
+    streams = await executor.run_many(
+        messages.CreateEmployee(
+            first_name=name,
+            last_name="Petrov",
+            phone="123456789",
+            birth_date=datetime.date(1998, 3, 4)
+        )
+        for name in ('Alex', 'Ivan')
+    )
+    assert [[m.__class__.__name__ for m in stream] for stream in streams] == [['EmployeeCreated', 'Error']] * 2
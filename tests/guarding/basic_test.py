@@ -0,0 +1,167 @@
+import asyncio
+import datetime
+import uuid
+
+import pytest
+from zorge.implementation.container import Container as DIContainer
+
+from pancho.aux import wrappers
+from pancho.definition import contracts
+from pancho.implementation import TaskExecutor, ConcurrencyLimit, RateLimit, CircuitBreaker
+from pancho.implementation.guarding import CircuitState
+from pancho.implementation.registry import ActorRegistry
+
+from ..definitions import messages
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+    return messages.EmployeeCreated(id=uuid.uuid4(), **employee.__dict__)
+
+
+def create_employee(first_name: str = "Alex"):
+    return messages.CreateEmployee(
+        first_name=first_name,
+        last_name="Petrov",
+        phone="123456789",
+        birth_date=datetime.date(1998, 3, 4)
+    )
+
+
+async def succeed():
+    return ()
+
+
+async def fail():
+    raise RuntimeError('Downstream is unavailable')
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    limit = ConcurrencyLimit(1, max_waiting=1)
+    gate = asyncio.Event()
+    running = []
+
+    async def call():
+        running.append(True)
+        await gate.wait()
+        return ()
+
+    first = asyncio.create_task(limit.run(call))
+    second = asyncio.create_task(limit.run(call))
+    await asyncio.sleep(0)
+    assert await limit.run(call) == (contracts.Error(status_code=503, message='Concurrency limit exceeded'),)
+    assert len(running) == 1
+    gate.set()
+    assert await asyncio.gather(first, second) == [(), ()]
+    assert len(running) == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit():
+    clock = Clock()
+    error = contracts.Error(status_code=429, message='Slow down')
+    limit = RateLimit(rate=2, burst=2, error=error, clock=clock)
+    assert [await limit.run(succeed) for _ in range(3)] == [(), (), (error,)]
+    clock.now = 0.5
+    assert [await limit.run(succeed) for _ in range(2)] == [(), (error,)]
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker():
+    clock = Clock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=10, clock=clock)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await breaker.run(fail)
+    assert breaker.state is CircuitState.OPEN
+    assert (await breaker.run(succeed))[0].message == 'Circuit breaker is open'
+
+    clock.now = 10
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    async def server_error():
+        return contracts.Error(status_code=502, message='Bad gateway'),
+
+    assert (await breaker.run(server_error))[0].status_code == 502
+    assert breaker.state is CircuitState.OPEN
+
+    clock.now = 20
+    assert await breaker.run(succeed) == ()
+    assert breaker.state is CircuitState.CLOSED
+
+
+class EmployeeStorage:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_executor_actor_guards():
+    calls = []
+
+    @wrappers.semantic('io', guards=(CircuitBreaker(failure_threshold=1),))
+    def employee_creation_writer(employee: messages.EmployeeCreated):
+        calls.append(employee.first_name)
+        raise RuntimeError('Storage is unavailable')
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employee_creation_writer)
+    executor = TaskExecutor(DIContainer(), actor_registry, error_wrapper=wrappers.default_exception)
+    assert (await executor.run(create_employee('Alex')))[-1].status_code == 500
+    stream = await executor.run(create_employee('Ivan'))
+    assert [m.__class__.__name__ for m in stream] == ['EmployeeCreated', 'Error']
+    assert stream[-1].message == 'Circuit breaker is open'
+    assert calls == ['Alex']
+
+
+@pytest.mark.asyncio
+async def test_executor_dependency_guards():
+    calls = []
+
+    async def employee_notification_writer(employee: messages.EmployeeCreated, storage: EmployeeStorage):
+        calls.append(employee.first_name)
+
+    container = DIContainer()
+    container.register_dependency(implementation=EmployeeStorage, contract=EmployeeStorage)
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employee_notification_writer)
+    executor = TaskExecutor(
+        container,
+        actor_registry,
+        dependency_guards={EmployeeStorage: (RateLimit(rate=1, clock=Clock()),)}
+    )
+    assert len(await executor.run(create_employee('Alex'))) == 1
+    stream = await executor.run(create_employee('Ivan'))
+    assert (stream[-1].status_code, stream[-1].message) == (429, 'Rate limit exceeded')
+    assert calls == ['Alex']
+
+
+@pytest.mark.asyncio
+async def test_executor_guard_deadline():
+    gate = asyncio.Event()
+
+    @wrappers.semantic('io', guards=(ConcurrencyLimit(1, max_waiting=1),))
+    async def employee_creation_writer(employee: messages.EmployeeCreated):
+        await gate.wait()
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employee_creation_writer)
+    executor = TaskExecutor(DIContainer(), actor_registry)
+    holder = asyncio.create_task(executor.run(create_employee('Alex')))
+    asyncio.get_running_loop().call_later(1, gate.set)
+    await asyncio.sleep(0.01)
+    started_at = asyncio.get_running_loop().time()
+    stream = await executor.run(create_employee('Ivan'), timeout=0.1)
+    assert asyncio.get_running_loop().time() - started_at < 0.5
+    assert (stream[-1].status_code, stream[-1].message) == (504, 'Task deadline exceeded')
+    assert len(await holder) == 1
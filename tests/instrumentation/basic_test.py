@@ -0,0 +1,95 @@
+import dataclasses
+import datetime
+import uuid
+
+import pytest
+
+from pancho.implementation.instrumentation import MetricsAggregator
+from pancho.implementation.processing import CQProcessor
+from pancho.implementation.registry import ActorRegistry, ActorSemanticKind
+
+from ..definitions import messages
+
+
+def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+    return messages.EmployeeCreated(id=uuid.uuid4(), **dataclasses.asdict(employee))
+
+
+def employee_creation_writer(employee: messages.EmployeeCreated):
+    if employee.first_name == 'Fail':
+        raise RuntimeError('Storage is unavailable')
+
+
+@pytest.fixture(scope="module")
+def actor_registry():
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employee_creation_writer)
+    return actor_registry
+
+
+async def _process(processor, first_name):
+    async for _ in processor(
+        messages.CreateEmployee(
+            first_name=first_name,
+            last_name="Doe",
+            phone="123456789",
+            birth_date=datetime.date(1978, 3, 4)
+        )
+    ):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_metrics_aggregator(actor_registry):
+    aggregator = MetricsAggregator(quantiles=(0.5, 0.99))
+    processor = CQProcessor(actor_registry, instrumentation=aggregator)
+    for _ in range(3):
+        await _process(processor, 'John')
+    with pytest.raises(RuntimeError):
+        await _process(processor, 'Fail')
+
+    stats = {s.actor_name.rsplit('.', 1)[-1]: s for s in aggregator.snapshot()}
+    usecase = stats['create_employee_usecase']
+    writer = stats['employee_creation_writer']
+    assert (usecase.semantic_kind, usecase.calls, usecase.errors, usecase.messages, usecase.scheduled) == (
+        ActorSemanticKind.USECASE, 4, 0, 4, 4
+    )
+    assert (writer.semantic_kind, writer.calls, writer.errors, writer.messages) == (ActorSemanticKind.IO, 4, 1, 0)
+    assert set(usecase.wall_time) == {0.5, 0.99}
+    assert usecase.wall_time[0.5] <= usecase.wall_time[0.99]
+    assert len(usecase.dependencies_time) == 2
+
+
+def unannotated_employee_usecase(employee: messages.CreateEmployee) -> None:
+    return messages.EmployeeCreated(id=uuid.uuid4(), **dataclasses.asdict(employee))
+
+
+def listed_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+    return [messages.EmployeeCreated(id=uuid.uuid4(), **dataclasses.asdict(employee))]
+
+
+async def stored_employee_writer(employee: messages.EmployeeCreated) -> messages.EmployeeStored:
+    return messages.EmployeeStored(id=employee.id, email='john.doe@example.com')
+
+
+@pytest.mark.parametrize('usecase', [unannotated_employee_usecase, listed_employee_usecase])
+@pytest.mark.asyncio
+async def test_instrumentation_keeps_stream(usecase):
+    actor_registry = ActorRegistry()
+    actor_registry.add(usecase)
+    actor_registry.add(stored_employee_writer)
+    streams = []
+    for observer in (None, MetricsAggregator()):
+        streams.append([
+            message.__class__.__name__
+            async for message in CQProcessor(actor_registry, instrumentation=observer)(
+                messages.CreateEmployee(
+                    first_name="John",
+                    last_name="Doe",
+                    phone="123456789",
+                    birth_date=datetime.date(1978, 3, 4)
+                )
+            )
+        ])
+    assert streams == [['EmployeeCreated', 'EmployeeStored']] * 2
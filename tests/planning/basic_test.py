@@ -0,0 +1,161 @@
+import dataclasses
+import datetime
+
+import pytest
+import zodchy
+
+from pancho.implementation.planning import ExecutionPlanner
+from pancho.implementation.processing import CQProcessor
+from pancho.implementation.registry import ActorRegistry
+
+from ..definitions import messages, actors
+
+
+def employee_ping_usecase(employee: messages.EmployeeCreated):
+    pass
+
+
+def employee_notification_writer(
+    stored: messages.EmployeeStored,
+    duplicated: messages.EmailDuplicated
+) -> messages.EmployeeStored:
+    pass
+
+
+@pytest.fixture(scope="module")
+def actor_registry():
+    actor_registry = ActorRegistry()
+    actor_registry.add(actors.employee_creation_auditor)
+    actor_registry.add(actors.create_employee_usecase)
+    actor_registry.add(actors.generate_work_email_usecase)
+    actor_registry.add(actors.create_employee_context)
+    actor_registry.add(actors.generate_supervised_employee_email_context)
+    actor_registry.add(actors.employee_writer)
+    return actor_registry
+
+
+def _names(entries):
+    return [e.runtime.executable.__name__ for e in entries]
+
+
+def test_plan_stages(actor_registry):
+    plan = ExecutionPlanner(actor_registry).plan(messages.CreateEmployee)
+    assert plan.complete
+    assert [[step.target.entry.runtime.executable.__name__ for step in stage] for stage in plan.stages] == [
+        ['create_employee_context'],
+        ['employee_creation_auditor'],
+        ['create_employee_usecase'],
+        ['generate_supervised_employee_email_context'],
+        ['generate_work_email_usecase'],
+        ['employee_writer'],
+    ]
+    assert _names(plan.context) == [
+        'create_employee_context',
+        'generate_supervised_employee_email_context'
+    ]
+    assert plan.unreachable == ()
+    assert plan.cyclic == ()
+    assert plan.width == 1
+
+
+def test_plan_diagnostics(actor_registry):
+    registry = ActorRegistry() + actor_registry
+    registry.add(employee_ping_usecase)
+    registry.add(employee_notification_writer)
+    plan = ExecutionPlanner(registry).plan(messages.CreateEmployee)
+    assert not plan.complete
+    assert _names(plan.unreachable) == ['employee_notification_writer']
+    assert _names(plan.cyclic) == ['employee_notification_writer']
+
+
+@pytest.mark.asyncio
+async def test_planned_processing(di_container, actor_registry):
+    planner = ExecutionPlanner(actor_registry)
+    async with di_container.get_resolver() as resolver:
+        stream = [
+            message async for message in CQProcessor(actor_registry, resolver, planner=planner)(
+                messages.CreateEmployee(
+                    first_name="John",
+                    last_name="Doe",
+                    phone="123456789",
+                    birth_date=datetime.date(1978, 3, 4)
+                )
+            )
+        ]
+    assert [m.__class__.__name__ for m in stream] == [
+        'CreateEmployeeContext',
+        'CreateEmployee',
+        'EmployeeCreated',
+        'GenerateEmployeeEmailContext',
+        'EmployeeWorkEmailGenerated',
+        'EmployeeStored'
+    ]
+
+
+@dataclasses.dataclass
+class RegisterVisitor(zodchy.codex.cqea.Command):
+    name: str
+
+
+@dataclasses.dataclass
+class VisitorRegistered(zodchy.codex.cqea.Event):
+    name: str
+
+
+@dataclasses.dataclass
+class VisitorGreeted(zodchy.codex.cqea.Event):
+    name: str
+
+
+def register_visitor_usecase(command: RegisterVisitor) -> VisitorRegistered | None:
+    return None
+
+
+def visitor_writer(command: RegisterVisitor) -> VisitorRegistered:
+    return VisitorRegistered(name=command.name)
+
+
+def greet_visitor_usecase(event: VisitorRegistered) -> VisitorGreeted:
+    return VisitorGreeted(name=event.name)
+
+
+@pytest.mark.asyncio
+async def test_planned_processing_with_late_producer():
+    registry = ActorRegistry()
+    registry.add(register_visitor_usecase)
+    registry.add(visitor_writer)
+    registry.add(greet_visitor_usecase)
+    planner = ExecutionPlanner(registry)
+    assert not planner.plan(RegisterVisitor).complete
+    stream = [
+        message.__class__.__name__
+        async for message in CQProcessor(registry, planner=planner)(RegisterVisitor(name='John'))
+    ]
+    assert stream == ['VisitorRegistered', 'VisitorGreeted']
+
+
+@dataclasses.dataclass
+class ReturningVisitorRegistered(VisitorRegistered):
+    pass
+
+
+def register_returning_visitor_usecase(command: RegisterVisitor) -> VisitorRegistered:
+    return ReturningVisitorRegistered(name=command.name)
+
+
+def returning_visitor_writer(event: ReturningVisitorRegistered) -> VisitorGreeted:
+    return VisitorGreeted(name=event.name)
+
+
+@pytest.mark.asyncio
+async def test_planned_processing_with_subclass_output():
+    registry = ActorRegistry()
+    registry.add(register_returning_visitor_usecase)
+    registry.add(returning_visitor_writer)
+    planner = ExecutionPlanner(registry)
+    assert not planner.plan(RegisterVisitor).complete
+    stream = [
+        message.__class__.__name__
+        async for message in CQProcessor(registry, planner=planner)(RegisterVisitor(name='John'))
+    ]
+    assert stream == ['ReturningVisitorRegistered', 'VisitorGreeted']
@@ -0,0 +1,58 @@
+import asyncio
+import datetime
+import multiprocessing
+import os
+import uuid
+
+import pytest
+from zorge.implementation.container import Container as DIContainer
+
+from pancho.aux import wrappers
+from pancho.implementation import WorkerPool
+from pancho.implementation.registry import ActorRegistry
+
+from ..definitions import messages
+
+
+def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+    if employee.first_name == 'Broken':
+        raise RuntimeError('Storage is unavailable')
+    return messages.EmployeeCreated(id=uuid.uuid4(), **employee.__dict__)
+
+
+async def employee_creation_writer(employee: messages.EmployeeCreated) -> messages.EmployeeStored:
+    await asyncio.sleep(0.1)
+    return messages.EmployeeStored(id=employee.id, email=str(os.getpid()))
+
+
+def create_employee(first_name: str):
+    return messages.CreateEmployee(
+        first_name=first_name,
+        last_name="Petrov",
+        phone="123456789",
+        birth_date=datetime.date(1998, 3, 4)
+    )
+
+
+@pytest.mark.parametrize('context', [None, multiprocessing.get_context('spawn')])
+@pytest.mark.asyncio
+async def test_worker_pool(context):
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(employee_creation_writer)
+    async with WorkerPool(
+        actor_registry,
+        DIContainer,
+        processes=2,
+        worker_concurrency=1,
+        error_wrapper=wrappers.default_exception,
+        context=context
+    ) as pool:
+        streams = await asyncio.gather(*(pool.run(create_employee(str(i))) for i in range(8)))
+        assert [created.first_name for created, _ in streams] == [str(i) for i in range(8)]
+        # a busy worker leaves queued tasks to the idle one
+        assert {int(stored.email) for _, stored in streams} == set(pool.pids)
+        assert os.getpid() not in pool.pids
+        failed = await pool.run(create_employee('Broken'))
+        assert [m.status_code for m in failed] == [500]
+    assert pool.pids == []
@@ -1,8 +1,9 @@
+import asyncio
+import dataclasses
 import datetime
 import uuid
 
 import pytest
-from zorge.implementation.container import Container as DIContainer
 
 from pancho.implementation.processing import CQProcessor
 from pancho.implementation.registry import ActorRegistry
@@ -10,47 +11,6 @@ from pancho.implementation.registry import ActorRegistry
 from ..definitions import messages, actors, depends
 
 
-class Connection:
-    def __init__(self, connection_id: int):
-        self._connection_id = connection_id
-
-    def execute(self, query: str) -> str:
-        return str(uuid.uuid5(uuid.NAMESPACE_DNS, query + str(self._connection_id)))
-
-
-class ConnectionPool:
-    def __init__(self):
-        self._counter = 0
-
-    def get_connection(self) -> depends.ConnectionContract:
-        self._counter += 1
-        return Connection(self._counter)
-
-
-class EmployeeRepository:
-    def __init__(self, pool: depends.ConnectionPoolContract):
-        self._connection_pool = pool
-
-    def save(self, first_name: str, last_name: str) -> dict:
-        return {
-            'id': self._connection_pool.get_connection().execute(f'{first_name} {last_name}')
-        }
-
-
-@pytest.fixture(scope="module")
-def di_container():
-    container = DIContainer()
-    container.register_dependency(
-        implementation=ConnectionPool,
-        contract=depends.ConnectionPoolContract
-    )
-    container.register_dependency(
-        implementation=EmployeeRepository,
-        contract=depends.EmployeeRepositoryContract
-    )
-    return container
-
-
 @pytest.fixture(scope="module")
 def actor_registry():
     actor_registry = ActorRegistry()
@@ -106,3 +66,124 @@ async def test_audit_error(di_container, actor_registry):
         'CreateEmployeeContext',
         'EmployeeDuplicated',
     ]
+
+
+class CountingResolver:
+    def __init__(self, resolver):
+        self._resolver = resolver
+        self.resolved = []
+
+    async def resolve(self, contract, context=None):
+        self.resolved.append(contract)
+        return await self._resolver.resolve(contract)
+
+
+def employee_audit_writer(
+    employee: messages.EmployeeCreated,
+    employee_repository: depends.EmployeeRepositoryContract,
+    connection_pool: depends.ConnectionPoolContract
+):
+    pass
+
+
+@pytest.mark.parametrize('transient,expected', [
+    ((), [depends.EmployeeRepositoryContract, depends.ConnectionPoolContract]),
+    (
+        (depends.EmployeeRepositoryContract,),
+        [
+            depends.EmployeeRepositoryContract,
+            depends.ConnectionPoolContract,
+            depends.EmployeeRepositoryContract
+        ]
+    ),
+])
+@pytest.mark.asyncio
+async def test_dependency_resolution_cache(di_container, actor_registry, transient, expected):
+    registry = ActorRegistry() + actor_registry
+    registry.add(employee_audit_writer)
+    async with di_container.get_resolver() as resolver:
+        resolver = CountingResolver(resolver)
+        processor = CQProcessor(registry, resolver, transient_dependencies=transient)
+        async for _ in processor(
+            messages.CreateEmployee(
+                first_name="John",
+                last_name="Doe",
+                phone="123456789",
+                birth_date=datetime.date(1978, 3, 4)
+            )
+        ):
+            pass
+    assert sorted(resolver.resolved, key=lambda c: c.__name__) == sorted(expected, key=lambda c: c.__name__)
+
+
+def normalize_employee_auditor(employee: messages.CreateEmployee) -> messages.CreateEmployee:
+    return dataclasses.replace(employee, first_name=employee.first_name.capitalize())
+
+
+def capture_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+    return messages.EmployeeCreated(id=uuid.uuid4(), **dataclasses.asdict(employee))
+
+
+@pytest.mark.asyncio
+async def test_jobs_see_audited_messages():
+    registry = ActorRegistry()
+    registry.add(capture_employee_usecase)
+    registry.add(normalize_employee_auditor)
+    stream = [
+        message async for message in CQProcessor(registry)(
+            messages.CreateEmployee(
+                first_name="john",
+                last_name="Doe",
+                phone="123456789",
+                birth_date=datetime.date(1978, 3, 4)
+            )
+        )
+    ]
+    assert [(m.__class__.__name__, m.first_name) for m in stream] == [
+        ('CreateEmployee', 'John'),
+        ('EmployeeCreated', 'John'),
+    ]
+
+
+class SlowResolver(CountingResolver):
+    async def resolve(self, contract, context=None):
+        await asyncio.sleep(0.01)
+        return await super().resolve(contract, context)
+
+
+async def first_employee_writer(
+    employee: messages.EmployeeCreated,
+    connection_pool: depends.ConnectionPoolContract
+):
+    pass
+
+
+async def second_employee_writer(
+    employee: messages.EmployeeCreated,
+    connection_pool: depends.ConnectionPoolContract
+):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_dependency_resolution_per_call(di_container):
+    registry = ActorRegistry()
+    registry.add(capture_employee_usecase)
+    registry.add(first_employee_writer)
+    registry.add(second_employee_writer)
+    async with di_container.get_resolver() as resolver:
+        resolver = SlowResolver(resolver)
+        processor = CQProcessor(registry, resolver, concurrent=True)
+        for _ in range(2):
+            resolver.resolved.clear()
+            async for _ in processor(
+                messages.CreateEmployee(
+                    first_name="John",
+                    last_name="Doe",
+                    phone="123456789",
+                    birth_date=datetime.date(1978, 3, 4)
+                )
+            ):
+                pass
+            # concurrent jobs share one resolution, every message resolves its own
+            assert resolver.resolved == [depends.ConnectionPoolContract]
@@ -0,0 +1,96 @@
+import asyncio
+import dataclasses
+import datetime
+import uuid
+
+import pytest
+
+from pancho.implementation.processing import CQProcessor
+from pancho.implementation.registry import ActorRegistry
+
+from ..definitions import messages
+
+finished = []
+
+
+@dataclasses.dataclass
+class EmployeeIndexed(messages.EmployeeStored):
+    pass
+
+
+def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+    return messages.EmployeeCreated(id=uuid.uuid4(), **dataclasses.asdict(employee))
+
+
+async def slow_employee_writer(employee: messages.EmployeeCreated) -> messages.EmployeeStored:
+    await asyncio.sleep(0.05)
+    finished.append('slow')
+    return messages.EmployeeStored(id=employee.id, email='slow')
+
+
+async def fast_employee_writer(employee: messages.EmployeeCreated) -> EmployeeIndexed:
+    await asyncio.sleep(0.01)
+    finished.append('fast')
+    return EmployeeIndexed(id=employee.id, email='fast')
+
+
+@pytest.fixture(scope="module")
+def actor_registry():
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    actor_registry.add(slow_employee_writer)
+    actor_registry.add(fast_employee_writer)
+    return actor_registry
+
+
+@pytest.mark.parametrize('concurrent,expected_finished', [
+    (False, ['slow', 'fast']),
+    (True, ['fast', 'slow']),
+])
+@pytest.mark.asyncio
+async def test_concurrent_tier(actor_registry, concurrent, expected_finished):
+    finished.clear()
+    stream = []
+    async for message in CQProcessor(actor_registry, concurrent=concurrent)(
+        messages.CreateEmployee(
+            first_name="John",
+            last_name="Doe",
+            phone="123456789",
+            birth_date=datetime.date(1978, 3, 4)
+        )
+    ):
+        stream.append(message)
+    assert finished == expected_finished
+    assert [m.__class__.__name__ for m in stream] == [
+        'EmployeeCreated',
+        'EmployeeStored',
+        'EmployeeIndexed'
+    ]
+
+
+def employee_first_name_auditor(employee: messages.CreateEmployee) -> messages.CreateEmployee:
+    return dataclasses.replace(employee, first_name=employee.first_name.capitalize())
+
+
+def employee_last_name_auditor(employee: messages.CreateEmployee) -> messages.CreateEmployee:
+    return dataclasses.replace(employee, last_name=employee.last_name.strip())
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+@pytest.mark.asyncio
+async def test_concurrent_auditors(concurrent):
+    actor_registry = ActorRegistry()
+    actor_registry.add(employee_first_name_auditor)
+    actor_registry.add(employee_last_name_auditor)
+    actor_registry.add(create_employee_usecase)
+    stream = [
+        message async for message in CQProcessor(actor_registry, concurrent=concurrent)(
+            messages.CreateEmployee(
+                first_name="john",
+                last_name=" doe ",
+                phone="123456789",
+                birth_date=datetime.date(1978, 3, 4)
+            )
+        )
+    ]
+    assert (stream[-1].first_name, stream[-1].last_name) == ('John', 'doe')
@@ -0,0 +1,91 @@
+import dataclasses
+import datetime
+import uuid
+
+import pytest
+
+from pancho.implementation.planning import ExecutionPlanner
+from pancho.implementation.processing import CQProcessor
+from pancho.implementation.registry import ActorRegistry
+
+from ..definitions import messages
+
+
+@dataclasses.dataclass
+class CreateEmployees(messages.CreateEmployee):
+    count: int = 1
+
+
+@dataclasses.dataclass
+class EmployeesStored(messages.EmployeeStored):
+    pass
+
+
+def create_employees_usecase(command: CreateEmployees) -> list[messages.EmployeeCreated]:
+    return [
+        messages.EmployeeCreated(
+            id=uuid.UUID(int=i),
+            first_name=command.first_name,
+            last_name=f'{command.last_name}{i}',
+            phone=command.phone,
+            birth_date=command.birth_date
+        )
+        for i in range(command.count)
+    ]
+
+
+def generate_work_email_usecase(employee: messages.EmployeeCreated) -> messages.EmployeeWorkEmailGenerated:
+    return messages.EmployeeWorkEmailGenerated(email=f'{employee.last_name}@example.com')
+
+
+def employees_writer(
+    employees: list[messages.EmployeeCreated],
+    emails: tuple[messages.EmployeeWorkEmailGenerated, ...]
+) -> EmployeesStored:
+    return EmployeesStored(id=uuid.UUID(int=len(employees)), email=','.join(e.email for e in emails))
+
+
+@pytest.fixture(scope="module")
+def actor_registry():
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employees_usecase)
+    actor_registry.add(generate_work_email_usecase)
+    actor_registry.add(employees_writer)
+    return actor_registry
+
+
+def test_collection_parameter(actor_registry):
+    entry = next(e for e in actor_registry if e.runtime.executable is employees_writer)
+    assert [(p.contract, p.many) for p in entry.parameters.domain] == [
+        (messages.EmployeeCreated, True),
+        (messages.EmployeeWorkEmailGenerated, True),
+    ]
+
+
+@pytest.mark.parametrize('multiple_instances,stored', [
+    (False, ('00000000-0000-0000-0000-000000000001', 'Doe0@example.com')),
+    (True, ('00000000-0000-0000-0000-000000000003', 'Doe0@example.com,Doe1@example.com,Doe2@example.com')),
+])
+@pytest.mark.parametrize('planned', [False, True])
+@pytest.mark.asyncio
+async def test_multiple_instances(actor_registry, multiple_instances, stored, planned):
+    processor = CQProcessor(
+        actor_registry,
+        multiple_instances=multiple_instances,
+        planner=ExecutionPlanner(actor_registry) if planned else None
+    )
+    stream = [
+        message async for message in processor(
+            CreateEmployees(
+                first_name="John",
+                last_name="Doe",
+                phone="123456789",
+                birth_date=datetime.date(1978, 3, 4),
+                count=3
+            )
+        )
+    ]
+    assert [m.__class__.__name__ for m in stream].count('EmployeeWorkEmailGenerated') == (
+        3 if multiple_instances else 1
+    )
+    assert (str(stream[-1].id), stream[-1].email) == stored
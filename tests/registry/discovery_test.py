@@ -0,0 +1,120 @@
+import json
+import sys
+import textwrap
+
+import pytest
+
+from pancho.implementation import ActorRegistry, discover_module
+
+from ..definitions import messages, context
+
+ACTORS = '''
+from tests.definitions import messages, context
+
+
+def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+    pass
+
+
+async def employee_creation_context(employee: messages.CreateEmployee) -> context.CreateEmployeeContext:
+    pass
+
+
+def _private_usecase(employee: messages.CreateEmployee):
+    pass
+'''
+
+WRITERS = '''
+from tests.definitions import messages
+
+
+async def employee_creation_writer(employee: messages.EmployeeCreated):
+    pass
+'''
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    root = tmp_path / 'discovered'
+    (root / 'io').mkdir(parents=True)
+    (root / '__init__.py').write_text('')
+    (root / 'actors.py').write_text(textwrap.dedent(ACTORS))
+    (root / 'io' / '__init__.py').write_text('')
+    (root / 'io' / 'writers.py').write_text(textwrap.dedent(WRITERS))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield root
+    for name in [name for name in sys.modules if name.split('.')[0] == 'discovered']:
+        del sys.modules[name]
+
+
+def _forget(*modules):
+    for module in modules:
+        sys.modules.pop(module, None)
+
+
+def test_discovery_writes_manifest(package, tmp_path):
+    manifest = tmp_path / 'manifest.json'
+    actor_registry = discover_module(ActorRegistry(), 'discovered', manifest)
+    assert {a.runtime.executable.__name__ for a in actor_registry} == {
+        'create_employee_usecase',
+        'employee_creation_context',
+        'employee_creation_writer'
+    }
+    modules = json.loads(manifest.read_text())['modules']
+    assert set(modules) == {'discovered', 'discovered.actors', 'discovered.io', 'discovered.io.writers'}
+    assert modules['discovered.actors']['actors'] == [
+        {'name': 'create_employee_usecase', 'contracts': ['tests.definitions.messages.CreateEmployee']},
+        {'name': 'employee_creation_context', 'contracts': ['tests.definitions.context.CreateEmployeeContext']},
+    ]
+
+
+def test_discovery_defers_imports(package, tmp_path):
+    manifest = tmp_path / 'manifest.json'
+    discover_module(ActorRegistry(), 'discovered', manifest)
+    _forget('discovered.actors', 'discovered.io.writers')
+
+    def create_employee_auditor(employee: messages.CreateEmployee) -> messages.CreateEmployee:
+        pass
+
+    actor_registry = discover_module(ActorRegistry(), 'discovered', manifest)
+    assert list(actor_registry) == []
+    actor_registry.add(create_employee_auditor)
+    assert 'discovered.actors' not in sys.modules
+    compiled = actor_registry.freeze()
+    assert 'discovered.actors' not in sys.modules
+
+    plan = compiled.plan(messages.CreateEmployee)
+    assert [t.entry.runtime.executable.__name__ for t in plan.targets] == [
+        'create_employee_auditor',
+        'create_employee_usecase'
+    ]
+    assert 'discovered.actors' in sys.modules
+    assert 'discovered.io.writers' not in sys.modules
+    assert [
+        t.entry.runtime.executable.__name__ for t in compiled.plan(context.CreateEmployeeContext).providers
+    ] == ['employee_creation_context']
+    assert [
+        t.entry.runtime.executable.__name__ for t in compiled.plan(messages.EmployeeCreated).targets
+    ] == ['employee_creation_writer']
+    assert {a.runtime.executable.__name__ for a in actor_registry} == {
+        'create_employee_auditor',
+        'create_employee_usecase',
+        'employee_creation_context',
+        'employee_creation_writer'
+    }
+
+
+def test_discovery_reanalyses_changed_modules(package, tmp_path):
+    manifest = tmp_path / 'manifest.json'
+    discover_module(ActorRegistry(), 'discovered', manifest)
+    (package / 'io' / 'writers.py').write_text(textwrap.dedent(WRITERS).replace(
+        'employee_creation_writer', 'employee_storage_writer'
+    ))
+    _forget('discovered.actors', 'discovered.io.writers')
+
+    actor_registry = discover_module(ActorRegistry(), 'discovered', manifest)
+    assert [a.runtime.executable.__name__ for a in actor_registry] == ['employee_storage_writer']
+    assert 'discovered.actors' not in sys.modules
+    assert json.loads(manifest.read_text())['modules']['discovered.io.writers']['actors'] == [
+        {'name': 'employee_storage_writer', 'contracts': ['tests.definitions.messages.EmployeeCreated']}
+    ]
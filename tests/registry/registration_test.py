@@ -1,7 +1,13 @@
+import pickle
+
 import pytest
 
-from pancho.implementation.registry import ActorRegistry, ActorSemanticKind, register_module
+from pancho.implementation import BatchWindow
+from pancho.implementation.registry import ActorRegistry, ActorSemanticKind, ActorExecutionPolicy, ActorExecutionKind, register_module
+from pancho.aux.wrappers import semantic, options
+from pancho.definition import exceptions
 from .definitions.actors import decorated, convention
+from ..definitions import messages, context
 
 
 @pytest.fixture(scope="function")
@@ -55,3 +61,165 @@ def test_convention_module_registration(registry):
         'employee_reader',
         'employee_creation_context'
     }
+
+
+def test_frozen_registry_plans(registry):
+    register_module(registry, convention)
+    compiled = registry.freeze()
+    assert registry.freeze() is compiled
+    plan = compiled.plan(messages.CreateEmployee)
+    assert {t.entry.runtime.executable.__name__ for t in plan.targets} == {
+        'create_employee_auditor',
+        'create_employee_usecase',
+    }
+    assert plan.providers == ()
+    assert {
+        t.entry.runtime.executable.__name__
+        for t in compiled.plan(context.CreateEmployeeContext).providers
+    } == {'employee_creation_context'}
+    assert [t.priority for t in plan.targets] == sorted(t.priority for t in plan.targets)
+
+
+def test_frozen_registry_subclass_plan(registry):
+    class UrgentCreateEmployee(messages.CreateEmployee):
+        pass
+
+    registry.add(convention.create_employee_usecase)
+    compiled = registry.freeze()
+    assert compiled.plan(UrgentCreateEmployee).entries == compiled.plan(messages.CreateEmployee).entries
+    assert compiled.plan(UrgentCreateEmployee) is compiled.plan(UrgentCreateEmployee)
+
+
+def test_frozen_registry_is_immutable(registry):
+    registry.add(convention.create_employee_usecase)
+    compiled = registry.freeze()
+    registry.add(convention.create_employee_auditor)
+    assert len(compiled.get(messages.CreateEmployee)) == 1
+    assert len(registry.freeze().get(messages.CreateEmployee)) == 2
+
+
+def test_actor_execution_policy(registry):
+    @semantic('reader', policy='thread')
+    def load_employee_report(query: messages.GetEmployee):
+        pass
+
+    registry.add(load_employee_report)
+    registry.add(convention.create_employee_usecase, policy='process')
+    registry.add(convention.create_employee_auditor)
+    assert {a.runtime.executable.__name__: a.runtime.policy for a in registry} == {
+        'load_employee_report': ActorExecutionPolicy.THREAD,
+        'create_employee_usecase': ActorExecutionPolicy.PROCESS,
+        'create_employee_auditor': None,
+    }
+
+
+def test_registry_snapshot(registry, tmp_path, monkeypatch):
+    register_module(registry, convention)
+    registry.add(decorated.save_employee, policy='thread')
+    registry.dump(tmp_path / 'registry.snapshot')
+
+    def analyse(*args):
+        raise AssertionError('snapshot must not be analysed again')
+
+    monkeypatch.setattr(ActorRegistry, '_derive_parameters', analyse)
+    loaded = ActorRegistry.load(tmp_path / 'registry.snapshot')
+    assert list(loaded) == list(registry)
+    assert loaded.get_by_id(id(decorated.save_employee)).runtime.policy == ActorExecutionPolicy.THREAD
+    assert [
+        t.entry.runtime.executable for t in loaded.freeze().plan(messages.CreateEmployee).targets
+    ] == [
+        t.entry.runtime.executable for t in registry.freeze().plan(messages.CreateEmployee).targets
+    ]
+
+
+def test_registry_snapshot_rejects_local_actors(registry, tmp_path):
+    def local_employee_writer(employee: messages.EmployeeCreated):
+        pass
+
+    registry.add(local_employee_writer)
+    with pytest.raises(exceptions.ActorReferenceNotResolvable):
+        registry.dump(tmp_path / 'registry.snapshot')
+
+
+def test_deferred_actor_registration(registry):
+    registry.add(decorated.save_employee, deferred=True)
+    assert registry.get_by_id(id(decorated.save_employee)).runtime.deferred
+    with pytest.raises(exceptions.CannotRegisterActor):
+        registry.add(decorated.create_employee, deferred=True)
+
+
+def test_batched_actor_registration(registry):
+    @semantic('io', batch=BatchWindow())
+    def employees_writer(employees: list[messages.EmployeeCreated]):
+        pass
+
+    @semantic('usecase', batch=BatchWindow())
+    def create_employees(employees: list[messages.CreateEmployee]):
+        pass
+
+    registry.add(employees_writer)
+    assert registry.get_by_id(id(employees_writer)).runtime.batch is not None
+    with pytest.raises(exceptions.CannotRegisterActor):
+        registry.add(create_employees)
+
+
+def test_actor_invoker(registry):
+    @semantic('usecase')
+    def create_employee(
+        command: messages.CreateEmployee,
+        ctx: context.CreateEmployeeContext
+    ) -> messages.EmployeeWorkEmailGenerated:
+        return messages.EmployeeWorkEmailGenerated(email=f'{command}@{ctx}')
+
+    @semantic('usecase')
+    def create_employee_reversed(ctx: context.CreateEmployeeContext, command: messages.CreateEmployee) -> None:
+        calls.append((command, ctx))
+
+    calls = []
+    registry.add(create_employee)
+    registry.add(create_employee_reversed)
+    entry = registry.get_by_id(id(create_employee))
+    assert entry.parameters.positional
+    assert entry.runtime.invoker(('john', 'example.com'), ()) == (
+        messages.EmployeeWorkEmailGenerated(email='john@example.com'),
+    )
+    entry = registry.get_by_id(id(create_employee_reversed))
+    assert not entry.parameters.positional
+    assert entry.runtime.invoker(('john', 'example.com'), ()) == ()
+    assert calls == [('john', 'example.com')]
+
+
+def test_actor_decorator_keeps_actor(registry):
+    def create_employee_usecase(command: messages.CreateEmployee):
+        pass
+
+    assert semantic('usecase', policy='thread')(create_employee_usecase) is create_employee_usecase
+    assert options(timeout=1.0)(create_employee_usecase) is create_employee_usecase
+    registry.add(create_employee_usecase)
+    entry = registry.get_by_id(id(create_employee_usecase))
+    assert entry.runtime.executable is create_employee_usecase
+    assert entry.runtime.kind == ActorExecutionKind.SYNC
+    assert (entry.runtime.policy, entry.runtime.timeout) == (ActorExecutionPolicy.THREAD, 1.0)
+
+
+def test_actor_string_annotations(registry):
+    def create_employee_usecase(
+        command: 'messages.CreateEmployee',
+        ctx: 'context.CreateEmployeeContext'
+    ) -> 'messages.EmployeeCreated':
+        pass
+
+    registry.add(create_employee_usecase)
+    entry = registry.get_by_id(id(create_employee_usecase))
+    assert [p.contract for p in entry.parameters.domain] == [messages.CreateEmployee]
+    assert [p.contract for p in entry.parameters.context] == [context.CreateEmployeeContext]
+    assert entry.return_annotation is messages.EmployeeCreated
+    assert len(registry.freeze().get(messages.CreateEmployee)) == 1
+
+
+def test_registry_pickling(registry):
+    register_module(registry, convention)
+    restored = pickle.loads(pickle.dumps(registry.freeze()))
+    entry = restored.get_by_id(id(convention.create_employee_auditor))
+    assert entry == registry.get_by_id(id(convention.create_employee_auditor))
+    assert entry.runtime.invoker(('employee',), ()) == ()
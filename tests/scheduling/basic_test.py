@@ -0,0 +1,104 @@
+import asyncio
+import dataclasses
+import datetime
+import uuid
+
+import pytest
+from zorge.implementation.container import Container as DIContainer
+
+from pancho.definition import contracts
+from pancho.implementation import TaskExecutor, TaskScheduler, PriorityClass
+from pancho.implementation.registry import ActorRegistry
+
+from ..definitions import messages
+
+
+@dataclasses.dataclass(frozen=True)
+class BuildEmployeesReport(contracts.Query):
+    department: str
+
+
+def command():
+    return messages.CreateEmployee(
+        first_name="Alex",
+        last_name="Petrov",
+        phone="123456789",
+        birth_date=datetime.date(1998, 3, 4)
+    )
+
+
+def query():
+    return BuildEmployeesReport(department='sales')
+
+
+async def occupy(scheduler, task, started, gate):
+    async with scheduler.slot(task):
+        started.append(task.__class__.__name__)
+        await gate.wait()
+
+
+@pytest.mark.asyncio
+async def test_weighted_fair_queuing():
+    scheduler = TaskScheduler(
+        classes=(PriorityClass('commands', weight=3), PriorityClass('reports')),
+        routes={messages.CreateEmployee: 'commands', BuildEmployeesReport: 'reports'},
+        concurrency=1
+    )
+    started = []
+    gate = asyncio.Event()
+    blocker = asyncio.create_task(occupy(scheduler, query(), [], gate))
+    await asyncio.sleep(0)
+    released = asyncio.Event()
+    released.set()
+    workers = [asyncio.create_task(occupy(scheduler, query(), started, released)) for _ in range(4)]
+    workers += [asyncio.create_task(occupy(scheduler, command(), started, released)) for _ in range(8)]
+    await asyncio.sleep(0)
+    assert {s.name: s.queued for s in scheduler.stats()} == {'commands': 8, 'reports': 4, 'default': 0}
+    gate.set()
+    await asyncio.gather(blocker, *workers)
+    # the blocking report was already charged to its class
+    assert started[:9] == ['CreateEmployee'] * 4 + ['BuildEmployeesReport'] + ['CreateEmployee'] * 3 + [
+        'BuildEmployeesReport'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_class_concurrency_cap():
+    scheduler = TaskScheduler(
+        classes=(PriorityClass('reports', concurrency=1),),
+        routes={BuildEmployeesReport: 'reports'},
+        concurrency=10
+    )
+    started = []
+    gate = asyncio.Event()
+    workers = [asyncio.create_task(occupy(scheduler, query(), started, gate)) for _ in range(3)]
+    workers.append(asyncio.create_task(occupy(scheduler, command(), started, gate)))
+    await asyncio.sleep(0)
+    assert sorted(started) == ['BuildEmployeesReport', 'CreateEmployee']
+    stats = {s.name: s for s in scheduler.stats()}
+    assert (stats['reports'].running, stats['reports'].queued, stats['reports'].peak_queued) == (1, 2, 2)
+    workers[1].cancel()
+    await asyncio.sleep(0)
+    assert stats['reports'].queued == 2 and scheduler.stats()[0].queued == 1
+    gate.set()
+    await asyncio.gather(*workers, return_exceptions=True)
+    assert started.count('BuildEmployeesReport') == 2
+    assert {s.name: (s.running, s.completed) for s in scheduler.stats()} == {
+        'reports': (0, 2),
+        'default': (0, 1)
+    }
+
+
+@pytest.mark.asyncio
+async def test_executor_scheduler():
+    async def create_employee_usecase(employee: messages.CreateEmployee) -> messages.EmployeeCreated:
+        await asyncio.sleep(0.01)
+        return messages.EmployeeCreated(id=uuid.uuid4(), **employee.__dict__)
+
+    actor_registry = ActorRegistry()
+    actor_registry.add(create_employee_usecase)
+    scheduler = TaskScheduler(concurrency=2)
+    executor = TaskExecutor(DIContainer(), actor_registry, scheduler=scheduler)
+    streams = await executor.run_many(command() for _ in range(5))
+    assert len(streams) == 5
+    assert [(s.name, s.completed, s.running, s.peak_queued) for s in scheduler.stats()] == [('default', 5, 0, 3)]